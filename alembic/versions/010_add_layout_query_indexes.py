@@ -0,0 +1,26 @@
+"""add composite indexes for layout editor and table suggestion queries
+
+Revision ID: 010_layout_query_indexes
+Revises: 009_add_unlock_at
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = '010_layout_query_indexes'
+down_revision = '009_add_unlock_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_restbl_tid_rid', 'reservations_tables', ['table_id', 'reservation_id'])
+    op.create_index('ix_res_date_id', 'reservations', ['date', 'id'])
+    op.create_index('ix_tables_room_active', 'tables', ['room_id', 'active'])
+
+
+def downgrade():
+    op.drop_index('ix_tables_room_active', table_name='tables')
+    op.drop_index('ix_res_date_id', table_name='reservations')
+    op.drop_index('ix_restbl_tid_rid', table_name='reservations_tables')
@@ -0,0 +1,24 @@
+"""add (room_id, date) and (reservation_id, table_id) indexes
+
+Revision ID: 011_res_room_date_index
+Revises: 010_layout_query_indexes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = '011_res_room_date_index'
+down_revision = '010_layout_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_res_room_date', 'reservations', ['room_id', 'date'])
+    op.create_index('ix_restbl_rid_tid', 'reservations_tables', ['reservation_id', 'table_id'])
+
+
+def downgrade():
+    op.drop_index('ix_restbl_rid_tid', table_name='reservations_tables')
+    op.drop_index('ix_res_room_date', table_name='reservations')
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse
 from app.schemas.table import TableCreate, TableUpdate, TableResponse
-from app.schemas.reservation import ReservationUpdate, ReservationWithTables
+from app.schemas.reservation import ReservationUpdate, ReservationResponse
 from app.schemas.user import UserCreate, UserResponse
 from app.services.reservation_service import ReservationService
 from app.services.pdf_service import PDFService
@@ -558,6 +558,7 @@ def send_test_email(
     try:
         service = ZohoEmailService()
         ok = service.send_email(to, "Test Email - The Castle Pub", "<p>This is a test email from the reservation system.</p>")
+        service.close()
         if ok:
             return {"status": "sent", "provider": "zoho"}
         return {"status": "skipped_or_failed", "message": "Zoho not configured or send failed"}
@@ -627,17 +628,18 @@ def delete_table(
             detail="Table not found"
         )
     
-    # Check if table has any active reservations
-    from app.models.reservation import ReservationTable, ReservationStatus
-    active_reservations = db.query(ReservationTable).join(
-        Reservation
-    ).filter(
-        ReservationTable.table_id == table_id,
-        Reservation.status == ReservationStatus.CONFIRMED,
-        Reservation.date >= date.today()
-    ).first()
+    # Check if table has any active reservations (EXISTS; no row is loaded)
+    has_active_reservations = db.query(
+        db.query(ReservationTable).join(
+            Reservation
+        ).filter(
+            ReservationTable.table_id == table_id,
+            Reservation.status == ReservationStatus.CONFIRMED,
+            Reservation.date >= date.today()
+        ).exists()
+    ).scalar()
     
-    if active_reservations:
+    if has_active_reservations:
         # Soft-delete instead of hard delete to keep reservation history intact
         table.active = False
         if hasattr(table, 'public_bookable'):
@@ -745,7 +747,7 @@ def setup_tables_one_time(
 
 
 # Reservation Management
-@router.get("/reservations", response_model=List[ReservationWithTables])
+@router.get("/reservations", response_model=List[ReservationResponse])
 def get_reservations(
     date_filter: date = None,
     db: Session = Depends(get_db),
@@ -761,7 +763,7 @@ def get_reservations(
     # Order by date and time (earliest first)
     reservations = query.order_by(Reservation.date, Reservation.time).all()
     
-    # Convert to ReservationWithTables format
+    # Convert to ReservationResponse format
     result = []
     for reservation in reservations:
         reservation_with_tables = reservation_service.get_reservation(str(reservation.id))
@@ -771,7 +773,7 @@ def get_reservations(
     return result
 
 
-@router.get("/reservations/{reservation_id}", response_model=ReservationWithTables)
+@router.get("/reservations/{reservation_id}", response_model=ReservationResponse)
 def get_reservation(
     reservation_id: str,
     db: Session = Depends(get_db),
@@ -790,7 +792,7 @@ def get_reservation(
     return reservation
 
 
-@router.put("/reservations/{reservation_id}", response_model=ReservationWithTables)
+@router.put("/reservations/{reservation_id}", response_model=ReservationResponse)
 def update_reservation(
     reservation_id: str,
     reservation_data: ReservationUpdate,
@@ -1267,7 +1269,7 @@ def list_table_blocks(
     _ensure_block_tables()
     try:
         # If table does not exist, return empty
-        exists = db.query(Table).filter(Table.id == table_id).first()
+        exists = db.query(db.query(Table).filter(Table.id == table_id).exists()).scalar()
         if not exists:
             return []
         blocks = (
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from datetime import date
 
@@ -87,7 +87,7 @@ def check_availability(payload: dict, db: Session = Depends(get_db)):
 
 
 @router.post("/reservations")
-def create_reservation(payload: dict, idempotency_key: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
+def create_reservation(payload: dict, background_tasks: BackgroundTasks, idempotency_key: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
     try:
         # Simple idempotency (no store) – could be extended with Redis
         from app.schemas.reservation import ReservationCreate
@@ -106,12 +106,9 @@ def create_reservation(payload: dict, idempotency_key: Optional[str] = Header(de
         reservation_service = ReservationService(db)
         created = reservation_service.create_reservation(reservation)
 
-        # Send confirmation email if email is present
-        try:
-            EmailService().send_reservation_confirmation(created)
-        except Exception:
-            # Do not fail booking on email issues
-            pass
+        # Send confirmation email after the response is returned; the service
+        # already logs and swallows delivery errors so the booking never fails on email
+        background_tasks.add_task(EmailService().send_reservation_confirmation, created)
 
         return created
     except Exception as e:
@@ -9,7 +9,7 @@ from app.core.database import get_db
 from app.models.user import User
 from app.models.reservation import Reservation, ReservationStatus, ReservationType, DashboardNote
 from app.schemas.reservation import (
-    DashboardStats, DashboardNote as DashboardNoteSchema, 
+    DashboardStats, WeeklyForecastEntry, GuestNote, DashboardNote as DashboardNoteSchema, 
     CustomerResponse, TodayReservation, UpcomingReservation
 )
 from app.api.deps import get_current_user
@@ -64,12 +64,12 @@ def get_dashboard_stats(
                 )
             ).all()
             
-            weekly_forecast.append({
-                "date": forecast_date.isoformat(),
-                "day_name": forecast_date.strftime("%A"),
-                "reservations": len(day_reservations),
-                "guests": sum(r.party_size for r in day_reservations)
-            })
+            weekly_forecast.append(WeeklyForecastEntry(
+                date=forecast_date,
+                day_name=forecast_date.strftime("%A"),
+                reservations=len(day_reservations),
+                guests=sum(r.party_size for r in day_reservations)
+            ))
         
         # Guest notes from recent reservations
         recent_reservations = db.query(Reservation).filter(
@@ -82,13 +82,13 @@ def get_dashboard_stats(
         
         guest_notes = []
         for reservation in recent_reservations:
-            guest_notes.append({
-                "customer_name": reservation.customer_name,
-                "notes": reservation.notes,
-                "date": reservation.date.isoformat(),
-                "reservation_type": reservation.reservation_type.value,
-                "party_size": reservation.party_size
-            })
+            guest_notes.append(GuestNote(
+                customer_name=reservation.customer_name,
+                notes=reservation.notes,
+                date=reservation.date,
+                reservation_type=reservation.reservation_type.value,
+                party_size=reservation.party_size
+            ))
         
         return DashboardStats(
             total_reservations_today=total_reservations_today,
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import date
+from collections import defaultdict
 from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
@@ -11,7 +12,7 @@ from app.schemas.layout import (
     RoomLayoutCreate, RoomLayoutUpdate, RoomLayoutResponse,
     LayoutEditorData, TableSuggestion, LayoutExport, LayoutImport
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 import json
 
 router = APIRouter()
@@ -21,14 +22,19 @@ router = APIRouter()
 async def get_layout_editor_data(
     room_id: str,
     target_date: date = Query(..., description="Target date for reservations"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> LayoutEditorData:
     """Get comprehensive data for the layout editor"""
     try:
         layout_service = LayoutService(db)
-        data = layout_service.get_layout_editor_data(room_id, target_date)
-        return data
+        # Polling clients send back the last ETag; unchanged data skips the whole build
+        data, etag = layout_service.get_layout_editor_data_conditional(room_id, target_date, if_none_match)
+        if data is None:
+            return Response(status_code=304, headers={"ETag": etag})
+        # Already a JSON-ready dict (cached); skip re-validating it against the response model
+        return ORJSONResponse(data, headers={"ETag": etag})
     except Exception as e:
         # Provide clearer diagnostics to the caller and logs for server
         import traceback as _tb
@@ -200,8 +206,8 @@ async def export_room_layout(
     """Export room layout as JSON"""
     try:
         layout_service = LayoutService(db)
-        export_data = layout_service.export_room_layout(room_id)
-        return LayoutExport(**export_data)
+        # Pre-encoded JSON body; the layout part is cached per layout version
+        return Response(layout_service.export_room_layout_bytes(room_id), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export room layout: {str(e)}")
 
@@ -237,7 +243,6 @@ async def get_daily_layout_view(
         # Get all active rooms
         from app.models.room import Room
         from app.models.reservation import Reservation, ReservationTable
-        from app.models.table import Table
         
         rooms = db.query(Room).filter(Room.active == True).all()
         
@@ -246,33 +251,34 @@ async def get_daily_layout_view(
             "rooms": []
         }
         
+        # All reservations for the day with their assigned tables, batched with selectin loads
+        # instead of one assignment query plus one table query per reservation
+        day_reservations = db.query(Reservation).options(
+            selectinload(Reservation.reservation_tables).joinedload(ReservationTable.table)
+        ).filter(
+            Reservation.room_id.in_([room.id for room in rooms]),
+            Reservation.date == target_date
+        ).all() if rooms else []
+        reservations_by_room = defaultdict(list)
+        for reservation in day_reservations:
+            reservations_by_room[reservation.room_id].append(reservation)
+        
         for room in rooms:
             # Get room layout data
-            room_data = layout_service.get_layout_editor_data(str(room.id), target_date)
-            
-            # Get all reservations for this room on this date
-            reservations = db.query(Reservation).filter(
-                Reservation.room_id == room.id,
-                Reservation.date == target_date
-            ).all()
+            room_data = layout_service.get_layout_editor_data_raw(str(room.id), target_date)
             
             # Convert reservations to proper format
             formatted_reservations = []
-            for reservation in reservations:
-                # Get table assignments for this reservation
-                table_assignments = db.query(ReservationTable).filter(
-                    ReservationTable.reservation_id == reservation.id
-                ).all()
-                
-                assigned_tables = []
-                for assignment in table_assignments:
-                    table = db.query(Table).filter(Table.id == assignment.table_id).first()
-                    if table:
-                        assigned_tables.append({
-                            "id": table.id,
-                            "name": table.name,
-                            "table_name": table.name
-                        })
+            for reservation in reservations_by_room.get(room.id, []):
+                assigned_tables = [
+                    {
+                        "id": assignment.table.id,
+                        "name": assignment.table.name,
+                        "table_name": assignment.table.name
+                    }
+                    for assignment in reservation.reservation_tables
+                    if assignment.table is not None
+                ]
                 
                 formatted_reservation = {
                     "id": reservation.id,
@@ -296,8 +302,8 @@ async def get_daily_layout_view(
             daily_data["rooms"].append({
                 "id": room.id,
                 "name": room.name,
-                "layout": room_data.room_layout,
-                "tables": room_data.tables,
+                "layout": room_data["room_layout"],
+                "tables": room_data["tables"],
                 "reservations": formatted_reservations
             })
         
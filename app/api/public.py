@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 from app.core.database import get_db
 from app.schemas.reservation import (
-    ReservationCreate, ReservationUpdate, ReservationWithTables,
+    ReservationCreate, ReservationUpdate, ReservationResponse,
     AvailabilityRequest, AvailabilityResponse
 )
 from app.schemas.room import RoomResponse
@@ -74,9 +74,10 @@ def get_widget_config(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to load widget config: {str(e)}")
 
 
-@router.post("/reservations", response_model=ReservationWithTables)
+@router.post("/reservations", response_model=ReservationResponse)
 def create_reservation(
     reservation_data: ReservationCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create a new reservation (public endpoint)"""
@@ -90,9 +91,9 @@ def create_reservation(
         reservation_service = ReservationService(db)
         reservation = reservation_service.create_reservation(reservation_data)
         
-        # Send confirmation email
+        # Send confirmation email after the response is returned
         email_service = EmailService()
-        email_service.send_reservation_confirmation(reservation)
+        background_tasks.add_task(email_service.send_reservation_confirmation, reservation)
         
         return reservation
     except ValueError as e:
@@ -345,10 +346,11 @@ def get_working_hours_for_date(date: str, db: Session = Depends(get_db)):
         )
 
 
-@router.put("/reservations/{token}", response_model=ReservationWithTables)
+@router.put("/reservations/{token}", response_model=ReservationResponse)
 def update_reservation_by_token(
     token: str,
     update_data: ReservationUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Update a reservation using a secure token"""
@@ -361,9 +363,11 @@ def update_reservation_by_token(
         updated_reservation = reservation_service.update_reservation(str(reservation.id), update_data)
         
         if updated_reservation:
-            # Send update email
+            # Send update email after the response is returned
             email_service = EmailService()
-            email_service.send_reservation_update(updated_reservation, "Reservation details updated")
+            background_tasks.add_task(
+                email_service.send_reservation_update, updated_reservation, "Reservation details updated"
+            )
             
             return updated_reservation
         else:
@@ -381,6 +385,7 @@ def update_reservation_by_token(
 @router.delete("/reservations/{token}")
 def cancel_reservation_by_token(
     token: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Cancel a reservation using a secure token"""
@@ -393,10 +398,10 @@ def cancel_reservation_by_token(
     reservation_details = reservation_service.get_reservation(str(reservation.id))
     
     if reservation_service.cancel_reservation(str(reservation.id)):
-        # Send cancellation email
+        # Send cancellation email after the response is returned
         if reservation_details:
             email_service = EmailService()
-            email_service.send_reservation_cancellation(reservation_details)
+            background_tasks.add_task(email_service.send_reservation_cancellation, reservation_details)
         
         return {"message": "Reservation cancelled successfully"}
     else:
@@ -26,6 +26,8 @@ class Settings(BaseSettings):
     
     # Redis (for background tasks)
     REDIS_URL: str = "redis://localhost:6379"
+    # Share layout editor cache entries across workers through Redis
+    LAYOUT_CACHE_REDIS: bool = False
     
     # Reservation settings
     MAX_PARTY_SIZE: int = 50
@@ -36,6 +38,9 @@ class Settings(BaseSettings):
     OPENING_HOUR: int = 11
     CLOSING_HOUR: int = 23
 
+    # Development: fail fast on accidental lazy loads (N+1) in service queries
+    SQL_RAISELOAD: bool = False
+
     # Chatbot integration
     CHATBOT_API_KEY: Optional[str] = None
     
@@ -3,7 +3,7 @@ from datetime import datetime, date, time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
 # Import routers - testing one by one
 try:
@@ -56,7 +56,8 @@ except Exception as e:
     chat_router = None
 
 # Create FastAPI app
-app = FastAPI(title="The Castle Pub Reservation System")
+# ORJSONResponse serializes response bodies with orjson instead of stdlib json
+app = FastAPI(title="The Castle Pub Reservation System", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -104,6 +105,13 @@ try:
 except Exception:
     pass  # Ignore static file mounting errors
 
+
+@app.on_event("shutdown")
+def flush_email_queue():
+    """Deliver any queued emails before the process exits"""
+    from app.services import email_service
+    email_service.flush()
+
 @app.get("/")
 async def root():
     """Serve the main HTML file"""
@@ -1022,7 +1030,7 @@ async def debug_reservation_creation():
 
 @app.post("/api/test-reservation-with-schema")
 async def test_reservation_with_schema():
-    """Test reservation creation with ReservationWithTables schema"""
+    """Test reservation creation with ReservationResponse schema"""
     try:
         from app.core.database import SessionLocal
         from app.models.room import Room
@@ -1030,7 +1038,7 @@ async def test_reservation_with_schema():
         from app.models.reservation import Reservation, ReservationTable
         from app.services.table_service import TableService
         from app.services.reservation_service import ReservationService
-        from app.schemas.reservation import ReservationCreate, ReservationWithTables
+        from app.schemas.reservation import ReservationCreate, ReservationResponse
         from datetime import date, time
         
         db = SessionLocal()
@@ -1105,9 +1113,9 @@ async def test_reservation_with_schema():
             } for table in table_combo
         ]
         
-        # Try to create ReservationWithTables
+        # Try to create ReservationResponse
         try:
-            result = ReservationWithTables(
+            result = ReservationResponse(
                 id=str(reservation.id),
                 customer_name=reservation.customer_name,
                 email=reservation.email,
@@ -1133,7 +1141,7 @@ async def test_reservation_with_schema():
             
             return {
                 "status": "success",
-                "message": "ReservationWithTables created successfully",
+                "message": "ReservationResponse created successfully",
                 "reservation": result.dict()
             }
             
@@ -1144,7 +1152,7 @@ async def test_reservation_with_schema():
             
             return {
                 "status": "error",
-                "message": f"ReservationWithTables creation failed: {str(e)}",
+                "message": f"ReservationResponse creation failed: {str(e)}",
                 "error_type": type(e).__name__
             }
         
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Time, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Date, Time, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -22,6 +22,10 @@ class ReservationType(str, enum.Enum):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_res_date_id", "date", "id"),
+        Index("ix_res_room_date", "room_id", "date"),
+    )
 
     id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     customer_name = Column(String, nullable=False)
@@ -60,6 +64,10 @@ class Reservation(Base):
 
 class ReservationTable(Base):
     __tablename__ = "reservations_tables"
+    __table_args__ = (
+        Index("ix_restbl_tid_rid", "table_id", "reservation_id"),
+        Index("ix_restbl_rid_tid", "reservation_id", "table_id"),
+    )
 
     id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     reservation_id = Column(Text, ForeignKey("reservations.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -7,6 +7,9 @@ from app.core.database import Base
 
 class Table(Base):
     __tablename__ = "tables"
+    __table_args__ = (
+        Index("ix_tables_room_active", "room_id", "active"),
+    )
 
     id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     room_id = Column(Text, ForeignKey("rooms.id"), nullable=False)
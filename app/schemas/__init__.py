@@ -2,8 +2,8 @@ from .user import UserCreate, UserLogin, UserResponse, Token
 from .room import RoomCreate, RoomUpdate, RoomResponse
 from .table import TableCreate, TableUpdate, TableResponse
 from .reservation import (
-    ReservationCreate, ReservationUpdate, ReservationResponse, 
-    ReservationWithTables, AvailabilityRequest, AvailabilityResponse
+    ReservationCreate, ReservationUpdate, ReservationResponse,
+    AvailabilityRequest, AvailabilityResponse
 )
 
 __all__ = [
@@ -11,5 +11,5 @@ __all__ = [
     "RoomCreate", "RoomUpdate", "RoomResponse",
     "TableCreate", "TableUpdate", "TableResponse",
     "ReservationCreate", "ReservationUpdate", "ReservationResponse",
-    "ReservationWithTables", "AvailabilityRequest", "AvailabilityResponse"
+    "AvailabilityRequest", "AvailabilityResponse"
 ] 
\ No newline at end of file
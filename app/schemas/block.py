@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime, time
 from app.models.settings import DayOfWeek
@@ -14,6 +14,8 @@ class RoomBlockCreate(BaseModel):
 
 
 class RoomBlockResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     room_id: str
     starts_at: datetime
@@ -24,9 +26,6 @@ class RoomBlockResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 
 class TableBlockCreate(BaseModel):
     table_id: str
@@ -38,6 +37,8 @@ class TableBlockCreate(BaseModel):
 
 
 class TableBlockResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     table_id: str
     starts_at: datetime
@@ -48,9 +49,6 @@ class TableBlockResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 
 class RoomBlockRuleCreate(BaseModel):
     room_id: str
@@ -64,6 +62,8 @@ class RoomBlockRuleCreate(BaseModel):
 
 
 class RoomBlockRuleResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     room_id: str
     day_of_week: DayOfWeek
@@ -73,9 +73,6 @@ class RoomBlockRuleResponse(BaseModel):
     reason: Optional[str]
     valid_from: Optional[datetime]
     valid_until: Optional[datetime]
-    
-    class Config:
-        from_attributes = True
 
 
 class TableBlockRuleCreate(BaseModel):
@@ -90,6 +87,8 @@ class TableBlockRuleCreate(BaseModel):
 
 
 class TableBlockRuleResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     table_id: str
     day_of_week: DayOfWeek
@@ -99,8 +98,5 @@ class TableBlockRuleResponse(BaseModel):
     reason: Optional[str]
     valid_from: Optional[datetime]
     valid_until: Optional[datetime]
-    
-    class Config:
-        from_attributes = True
 
 
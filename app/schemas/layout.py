@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, time
 from enum import Enum
@@ -61,15 +61,14 @@ class TableLayoutUpdate(BaseModel):
 
 
 class TableLayoutResponse(TableLayoutBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     table_id: str
     room_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
 
 # Room Layout Schemas
 class RoomLayoutBase(BaseModel):
@@ -103,17 +102,18 @@ class RoomLayoutUpdate(BaseModel):
 
 
 class RoomLayoutResponse(RoomLayoutBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     room_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
 
 # Reservation schemas for layout integration
 class ReservationSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     customer_name: str
     time: time
@@ -124,12 +124,11 @@ class ReservationSummary(BaseModel):
     notes: Optional[str] = None
     admin_notes: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 # Table with reservation data for layout editor
 class TableWithReservation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     layout_id: str
     table_id: str
     table_name: str
@@ -150,20 +149,16 @@ class TableWithReservation(BaseModel):
     z_index: int
     reservations: List[ReservationSummary]
 
-    class Config:
-        from_attributes = True
-
 
 # Layout Editor Data
 class LayoutEditorData(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     room_id: str
     room_layout: RoomLayoutResponse
     tables: List[TableWithReservation]
     reservations: List[ReservationSummary]
 
-    class Config:
-        from_attributes = True
-
 
 # Table Assignment Suggestions
 class TableSuggestion(BaseModel):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime, date, time
 from app.models.reservation import ReservationStatus, ReservationType
@@ -40,6 +40,8 @@ class TableAssignment(BaseModel):
 
 
 class ReservationResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     customer_name: str
     email: str
@@ -56,13 +58,7 @@ class ReservationResponse(BaseModel):
     admin_notes: Optional[str]
     created_at: datetime
     updated_at: Optional[datetime]
-
-    class Config:
-        from_attributes = True
-
-
-class ReservationWithTables(ReservationResponse):
-    tables: List[TableAssignment] = []
+    tables: List[TableAssignment] = Field(default_factory=list)
 
 
 class AvailabilityRequest(BaseModel):
@@ -89,6 +85,8 @@ class AvailabilityResponse(BaseModel):
 
 # Dashboard-specific schemas
 class DashboardNote(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[str] = None
     title: str
     content: str
@@ -97,8 +95,20 @@ class DashboardNote(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+
+class WeeklyForecastEntry(BaseModel):
+    date: date
+    day_name: str
+    reservations: int
+    guests: int
+
+
+class GuestNote(BaseModel):
+    customer_name: str
+    notes: str
+    date: date
+    reservation_type: str
+    party_size: int
 
 
 class DashboardStats(BaseModel):
@@ -106,11 +116,13 @@ class DashboardStats(BaseModel):
     total_guests_today: int
     total_reservations_week: int
     total_guests_week: int
-    weekly_forecast: List[dict]  # Array of {date, reservations, guests}
-    guest_notes: List[dict]  # Array of {customer_name, notes, date, reservation_type}
+    weekly_forecast: List[WeeklyForecastEntry]
+    guest_notes: List[GuestNote]
 
 
 class CustomerResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
     customer_name: str
     email: str
     phone: str
@@ -119,11 +131,10 @@ class CustomerResponse(BaseModel):
     favorite_room: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class TodayReservation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     customer_name: str
     date: Optional[date] = None
@@ -135,11 +146,10 @@ class TodayReservation(BaseModel):
     notes: Optional[str]
     admin_notes: Optional[str]
 
-    class Config:
-        from_attributes = True 
-
 
 class UpcomingReservation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     customer_name: str
     date: date
@@ -150,7 +160,4 @@ class UpcomingReservation(BaseModel):
     status: ReservationStatus
     room_name: Optional[str] = None
     notes: Optional[str] = None
-    admin_notes: Optional[str] = None
-
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    admin_notes: Optional[str] = None
\ No newline at end of file
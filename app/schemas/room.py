@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -19,10 +19,9 @@ class RoomUpdate(BaseModel):
 
 
 class RoomResponse(RoomBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     active: bool
     created_at: datetime
-    updated_at: Optional[datetime] = None
-
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    updated_at: Optional[datetime] = None
\ No newline at end of file
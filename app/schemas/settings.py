@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import time
 from app.models.settings import DayOfWeek
@@ -12,7 +12,7 @@ class WorkingHoursBase(BaseModel):
 
 
 class WorkingHoursCreate(WorkingHoursBase):
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class WorkingHoursUpdate(BaseModel):
@@ -22,10 +22,9 @@ class WorkingHoursUpdate(BaseModel):
 
 
 class WorkingHoursResponse(WorkingHoursBase):
-    id: str
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
+    id: str
 
 
 class RestaurantSettingBase(BaseModel):
@@ -35,7 +34,7 @@ class RestaurantSettingBase(BaseModel):
 
 
 class RestaurantSettingCreate(RestaurantSettingBase):
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class RestaurantSettingUpdate(BaseModel):
@@ -44,11 +43,12 @@ class RestaurantSettingUpdate(BaseModel):
 
 
 class RestaurantSettingResponse(RestaurantSettingBase):
-    id: str
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
+    id: str
 
 
 class WeeklySchedule(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     working_hours: List[WorkingHoursResponse] 
\ No newline at end of file
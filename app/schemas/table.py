@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -28,6 +28,8 @@ class TableUpdate(BaseModel):
 
 
 class TableResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     room_id: str
     name: str
@@ -40,7 +42,4 @@ class TableResponse(BaseModel):
     width: Optional[int]
     height: Optional[int]
     created_at: datetime
-    updated_at: Optional[datetime]
-
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    updated_at: Optional[datetime]
\ No newline at end of file
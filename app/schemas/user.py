@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from app.models.user import UserRole
@@ -17,15 +17,14 @@ class UserLogin(BaseModel):
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     username: str
     email: Optional[str] = None
     role: UserRole
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class Token(BaseModel):
     access_token: str
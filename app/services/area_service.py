@@ -1,13 +1,29 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, asc, desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, asc, desc, func
 from typing import List, Optional, Dict, Any
 from app.models.room import Room, AreaType
 from app.models.table import Table
 from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse
 from datetime import datetime
+from collections import Counter
 import uuid
 
 
+# Preferred area type per reservation type, used by get_area_recommendations
+_TYPE_PREFERENCES: Dict[str, AreaType] = {
+    "dinner": AreaType.INDOOR,
+    "lunch": AreaType.INDOOR,
+    "breakfast": AreaType.INDOOR,
+    "drinks": AreaType.OUTDOOR,
+    "party": AreaType.SHARED,
+    "private": AreaType.INDOOR,
+    "celebration": AreaType.SHARED,
+    "team_event": AreaType.SHARED,
+    "fun": AreaType.OUTDOOR,
+    "special_event": AreaType.SHARED,
+}
+
+
 class AreaService:
     def __init__(self, db: Session):
         self.db = db
@@ -70,56 +86,48 @@ class AreaService:
         # Order by priority (lower number = higher priority)
         areas = query.order_by(Room.priority.asc()).all()
         
-        # Check capacity for each area
+        # Check capacity for each area; only the chosen area is converted to a response
+        capacities = self._capacity_map()
         for area in areas:
-            total_capacity = self._get_area_capacity(area.id)
-            if total_capacity >= party_size:
-                return RoomResponse.from_orm(area)
+            if capacities.get(area.id, 0) >= party_size:
+                return RoomResponse.model_validate(area)
         
         return None
 
-    def _get_area_capacity(self, area_id: str) -> int:
-        """Get total capacity of all tables in an area"""
-        tables = self.db.query(Table).filter(
-            and_(
-                Table.room_id == area_id,
-                Table.active == True
-            )
-        ).all()
-        return sum(table.capacity for table in tables)
+    def _capacity_map(self) -> Dict[str, int]:
+        """Get total active table capacity for every area in a single grouped query"""
+        rows = self.db.query(Table.room_id, func.sum(Table.capacity)).filter(
+            Table.active == True
+        ).group_by(Table.room_id).all()
+        return {room_id: int(total or 0) for room_id, total in rows}
 
     def get_area_statistics(self) -> Dict[str, Any]:
         """Get statistics about all areas"""
-        areas = self.db.query(Room).filter(Room.active == True).all()
+        areas = self.db.query(Room).options(selectinload(Room.tables)).filter(Room.active == True).all()
+        
+        # Count by type and priority
+        type_counter = Counter(area.area_type.value for area in areas)
+        priority_counter = Counter(area.priority for area in areas)
         
         stats = {
             "total_areas": len(areas),
             "by_type": {
-                "indoor": 0,
-                "outdoor": 0,
-                "shared": 0
+                "indoor": type_counter["indoor"],
+                "outdoor": type_counter["outdoor"],
+                "shared": type_counter["shared"]
             },
-            "by_priority": {},
+            "by_priority": dict(priority_counter),
             "total_capacity": 0,
             "fallback_areas": 0
         }
         
         for area in areas:
-            # Count by type
-            stats["by_type"][area.area_type.value] += 1
-            
-            # Count by priority
-            priority = area.priority
-            if priority not in stats["by_priority"]:
-                stats["by_priority"][priority] = 0
-            stats["by_priority"][priority] += 1
-            
             # Count fallback areas
             if area.is_fallback_area:
                 stats["fallback_areas"] += 1
             
-            # Calculate total capacity
-            stats["total_capacity"] += self._get_area_capacity(area.id)
+            # Calculate total capacity (tables are eager-loaded above)
+            stats["total_capacity"] += sum(table.capacity for table in area.tables if table.active)
         
         return stats
 
@@ -127,20 +135,7 @@ class AreaService:
         """Get area recommendations based on party size and reservation type"""
         
         # Determine preferred area type based on reservation type
-        type_preferences = {
-            "dinner": AreaType.INDOOR,
-            "lunch": AreaType.INDOOR,
-            "breakfast": AreaType.INDOOR,
-            "drinks": AreaType.OUTDOOR,
-            "party": AreaType.SHARED,
-            "private": AreaType.INDOOR,
-            "celebration": AreaType.SHARED,
-            "team_event": AreaType.SHARED,
-            "fun": AreaType.OUTDOOR,
-            "special_event": AreaType.SHARED,
-        }
-        
-        preferred_type = type_preferences.get(reservation_type, AreaType.INDOOR)
+        preferred_type = _TYPE_PREFERENCES.get(reservation_type, AreaType.INDOOR)
         
         # Get all areas
         all_areas = self.db.query(Room).filter(Room.active == True).order_by(Room.priority.asc()).all()
@@ -154,8 +149,10 @@ class AreaService:
             "fallback_areas": []
         }
         
+        # Capacities for every area come from one grouped query
+        capacities = self._capacity_map()
         for area in all_areas:
-            capacity = self._get_area_capacity(area.id)
+            capacity = capacities.get(area.id, 0)
             area_info = {
                 "id": str(area.id),
                 "name": area.name,
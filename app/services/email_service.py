@@ -1,184 +1,427 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from datetime import date, time
+from jinja2 import Environment
 from app.core.config import settings
 from app.core.security import create_reservation_token
-from app.schemas.reservation import ReservationWithTables
+from app.schemas.reservation import ReservationResponse
+import functools
+import itertools
 import logging
-import os
+import queue
+import re
+import threading
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+# Email bodies are compiled once at import time and rendered per send; autoescape
+# keeps customer-supplied fields (name, notes) from injecting HTML
+_env = Environment(autoescape=True)
+
+_CONFIRMATION_TEMPLATE = _env.from_string("""
+    <html>
+    <body>
+        <div style="text-align:center;margin-bottom:20px">
+            <img src="{{ frontend_url }}/static/logo.png" alt="The Castle Pub" style="max-height:60px" />
+        </div>
+        <h2 style="font-family:Arial, sans-serif;color:#222">Reservation Confirmation</h2>
+        <p>Dear {{ reservation.customer_name }},</p>
+        
+        <p>Your reservation has been confirmed at <strong>The Castle Pub</strong>.</p>
+        
+        <h3>Reservation Details:</h3>
+        <ul>
+            <li><strong>Date:</strong> {{ date_str }}</li>
+            <li><strong>Time:</strong> {{ time_str }}</li>
+            <li><strong>Party Size:</strong> {{ reservation.party_size }} people</li>
+            <li><strong>Room:</strong> {{ reservation.room_name }}</li>
+        </ul>
+        
+        {% if reservation.notes %}<p><strong>Special Notes:</strong> {{ reservation.notes }}</p>{% endif %}
+        
+        <h3>Manage Your Reservation:</h3>
+        <p>
+            <a href="{{ frontend_url }}/cancel/{{ cancel_token }}" 
+               style="background-color: #dc3545; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">
+                Cancel Reservation
+            </a>
+            <a href="{{ frontend_url }}/edit/{{ edit_token }}" 
+               style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
+                Modify Reservation
+            </a>
+        </p>
+        
+        <p><strong>Important:</strong> Please arrive 5 minutes before your reservation time.</p>
+        
+        <p>If you have any questions, please contact us at {{ contact_email }}</p>
+        
+        <p>Thank you for choosing The Castle Pub!</p>
+        
+        <hr>
+        <p style="font-size: 12px; color: #666;">
+            This email was sent to {{ reservation.email }}. 
+            If you did not make this reservation, please contact us immediately.
+        </p>
+    </body>
+    </html>
+    """)
+
+_UPDATE_TEMPLATE = _env.from_string("""
+    <html>
+    <body>
+        <h2>Reservation Updated</h2>
+        <p>Dear {{ reservation.customer_name }},</p>
+        
+        <p>Your reservation at <strong>The Castle Pub</strong> has been updated.</p>
+        
+        <h3>Updated Reservation Details:</h3>
+        <ul>
+            <li><strong>Date:</strong> {{ date_str }}</li>
+            <li><strong>Time:</strong> {{ time_str }}</li>
+            <li><strong>Party Size:</strong> {{ reservation.party_size }} people</li>
+            <li><strong>Room:</strong> {{ reservation.room_name }}</li>
+        </ul>
+        
+        <p><strong>Changes Made:</strong> {{ changes }}</p>
+        
+        <p>If you have any questions, please contact us at {{ contact_email }}</p>
+        
+        <p>Thank you for choosing The Castle Pub!</p>
+    </body>
+    </html>
+    """)
+
+_CANCELLATION_TEMPLATE = _env.from_string("""
+    <html>
+    <body>
+        <h2>Reservation Cancelled</h2>
+        <p>Dear {{ reservation.customer_name }},</p>
+        
+        <p>Your reservation at <strong>The Castle Pub</strong> has been cancelled.</p>
+        
+        <h3>Cancelled Reservation Details:</h3>
+        <ul>
+            <li><strong>Date:</strong> {{ date_str }}</li>
+            <li><strong>Time:</strong> {{ time_str }}</li>
+            <li><strong>Party Size:</strong> {{ reservation.party_size }} people</li>
+            <li><strong>Room:</strong> {{ reservation.room_name }}</li>
+        </ul>
+        
+        <p>We hope to see you again soon!</p>
+        
+        <p>If you have any questions, please contact us at {{ contact_email }}</p>
+        
+        <p>Thank you for choosing The Castle Pub!</p>
+    </body>
+    </html>
+    """)
+
+
+# Cheap local sanity check on recipients; no external/DNS validation is performed
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _has_valid_email(reservation: ReservationResponse) -> bool:
+    return bool(reservation.email) and _EMAIL_RE.match(reservation.email) is not None
+
+
+@functools.lru_cache(maxsize=512)
+def _format_date(value: date) -> str:
+    return value.strftime('%A, %B %d, %Y')
+
+
+@functools.lru_cache(maxsize=512)
+def _format_time(value: time) -> str:
+    return value.strftime('%I:%M %p')
+
+
+def _format_dt(reservation: ReservationResponse) -> Tuple[str, str]:
+    """Return the (date, time) display strings used in reservation emails (memoized per value)"""
+    return _format_date(reservation.date), _format_time(reservation.time)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_zoho_service():
+    """Return the process-wide ZohoEmailService (env credentials are read once)"""
+    from app.services.email_service_zoho import ZohoEmailService
+    return ZohoEmailService()
+
+
+def _send_via_zoho(to_email: str, subject: str, html_content: str) -> bool:
+    try:
+        zoho = _get_zoho_service()
+        if not getattr(zoho, 'enabled', False):
+            return False
+        return zoho.send_email(to_email, subject, html_content, reply_to=getattr(settings, 'CONTACT_EMAIL', None))
+    except Exception as e:
+        logger.error(f"Zoho send failed: {e}")
+        return False
+
+
+# Outgoing emails are delivered by one daemon worker so request threads never wait on SMTP
+_email_queue: "queue.Queue[Tuple[str, str, str, int]]" = queue.Queue()
+_worker_lock = threading.Lock()
+_worker_thread: Optional[threading.Thread] = None
+
+# flush() waits at most this long for the queue to drain, so a hung SMTP session cannot block shutdown
+EMAIL_FLUSH_TIMEOUT = 30.0
+
+# Failed sends are retried off the worker thread with exponential backoff (1s, 2s, 4s)
+EMAIL_MAX_RETRIES = 3
+EMAIL_RETRY_BASE_DELAY = 1.0
+
+# Retries waiting on their backoff timer, so flush() can hand them to the worker at shutdown
+_pending_retries: Dict[int, Tuple[threading.Timer, Tuple[str, str, str, int]]] = {}
+_retry_lock = threading.Lock()
+_retry_ids = itertools.count()
+
+
+def _retry_later(to_email: str, subject: str, html_content: str, attempt: int):
+    if attempt >= EMAIL_MAX_RETRIES:
+        logger.error(f"Email '{subject}' to {to_email} failed via Zoho; giving up after {attempt + 1} attempts")
+        return
+    delay = EMAIL_RETRY_BASE_DELAY * (2 ** attempt)
+    logger.warning(f"Email '{subject}' to {to_email} failed via Zoho; retrying in {delay:.0f}s")
+    retry_id = next(_retry_ids)
+    timer = threading.Timer(delay, _fire_retry, args=(retry_id,))
+    timer.daemon = True
+    with _retry_lock:
+        _pending_retries[retry_id] = (timer, (to_email, subject, html_content, attempt + 1))
+    timer.start()
 
-class EmailService:
-    def __init__(self):
-        # Zoho envs only
-        self.zoho_email = os.getenv("ZOHO_EMAIL") or os.getenv("ZOHO_MAIL")
-        self.zoho_password = os.getenv("ZOHO_PASSWORD") or os.getenv("ZOHO_APP_PASSWORD")
 
-    def _send_via_zoho(self, to_email: str, subject: str, html_content: str) -> bool:
+def _fire_retry(retry_id: int):
+    """Backoff elapsed: move the retry from the registry back onto the queue"""
+    with _retry_lock:
+        pending = _pending_retries.pop(retry_id, None)
+    if pending is not None:
+        _email_queue.put(pending[1])
+
+
+def _requeue_pending_retries() -> int:
+    """Cancel every backoff timer and queue its retry immediately; returns how many were moved"""
+    with _retry_lock:
+        pending = list(_pending_retries.values())
+        _pending_retries.clear()
+    for timer, job in pending:
+        timer.cancel()
+        _email_queue.put(job)
+    return len(pending)
+
+
+def _email_worker():
+    while True:
+        to_email, subject, html_content, attempt = _email_queue.get()
         try:
-            from app.services.email_service_zoho import ZohoEmailService
-            zoho = ZohoEmailService()
-            if not getattr(zoho, 'enabled', False):
-                return False
-            return zoho.send_email(to_email, subject, html_content, reply_to=getattr(settings, 'CONTACT_EMAIL', None))
+            if _send_via_zoho(to_email, subject, html_content):
+                logger.info(f"Email '{subject}' sent to {to_email}")
+            else:
+                _retry_later(to_email, subject, html_content, attempt)
         except Exception as e:
-            logger.error(f"Zoho send failed: {e}")
-            return False
+            logger.error(f"Email worker error: {e}")
+        finally:
+            _email_queue.task_done()
+
+
+def _ensure_worker():
+    """Start the email worker thread on first use"""
+    global _worker_thread
+    if _worker_thread is not None and _worker_thread.is_alive():
+        return
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=_email_worker, name="email-worker", daemon=True)
+            _worker_thread.start()
 
-    def send_reservation_confirmation(self, reservation: ReservationWithTables) -> bool:
-        """Send confirmation email for a new reservation (Zoho preferred, fallback to SendGrid)."""
-        if not reservation.email:
-            logger.info("Reservation has no email; skipping confirmation email.")
+
+# Update emails for the same reservation arriving within this window are merged into one
+UPDATE_DEBOUNCE_SECONDS = 0.5
+_UPDATE_SUBJECT = "Reservation Updated - The Castle Pub"
+
+# reservation id -> (latest reservation, distinct change descriptions in arrival order, flush timer)
+_pending_updates: Dict[str, Tuple[ReservationResponse, List[str], threading.Timer]] = {}
+_pending_lock = threading.Lock()
+
+
+def _render_update(reservation: ReservationResponse, changes: str) -> str:
+    date_str, time_str = _format_dt(reservation)
+    return _UPDATE_TEMPLATE.render(
+        reservation=reservation,
+        date_str=date_str,
+        time_str=time_str,
+        changes=changes,
+        contact_email=settings.CONTACT_EMAIL,
+    )
+
+
+def _schedule_update(reservation: ReservationResponse, changes: str):
+    """Buffer an update email; later updates in the window replace the reservation and append changes"""
+    key = str(reservation.id)
+    with _pending_lock:
+        pending = _pending_updates.get(key)
+        if pending is not None:
+            _, change_list, timer = pending
+            # Whole-string comparison: a change that is a substring of an earlier one is still distinct
+            if changes and changes not in change_list:
+                change_list.append(changes)
+            _pending_updates[key] = (reservation, change_list, timer)
+            return
+        timer = threading.Timer(UPDATE_DEBOUNCE_SECONDS, _flush_update, args=(key,))
+        timer.daemon = True
+        _pending_updates[key] = (reservation, [changes] if changes else [], timer)
+    timer.start()
+
+
+def _flush_update(key: str):
+    """Render and queue the latest buffered update for a reservation"""
+    with _pending_lock:
+        pending = _pending_updates.pop(key, None)
+    if pending is None:
+        return
+    reservation, change_list, timer = pending
+    timer.cancel()
+    try:
+        _ensure_worker()
+        html_content = _render_update(reservation, "; ".join(change_list))
+        _email_queue.put((reservation.email, _UPDATE_SUBJECT, html_content, 0))
+        logger.info(f"Update email queued for {reservation.email}")
+    except Exception as e:
+        logger.error(f"Error sending update email: {str(e)}")
+
+
+def _discard_update(reservation_id) -> None:
+    """Drop a buffered update (e.g. the reservation was cancelled before it went out)"""
+    with _pending_lock:
+        pending = _pending_updates.pop(str(reservation_id), None)
+    if pending is not None:
+        pending[2].cancel()
+
+
+def flush(timeout: float = EMAIL_FLUSH_TIMEOUT) -> bool:
+    """Wait up to timeout seconds for every queued email to be handed to SMTP (used on shutdown)"""
+    with _pending_lock:
+        keys = list(_pending_updates)
+    for key in keys:
+        _flush_update(key)
+    if _requeue_pending_retries():
+        _ensure_worker()
+    if _worker_thread is None or not _worker_thread.is_alive():
+        return True
+    # Queue.join() has no timeout; wait on its condition with a deadline instead
+    deadline = monotonic() + timeout
+    with _email_queue.all_tasks_done:
+        while _email_queue.unfinished_tasks:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                logger.warning(f"Email flush timed out with {_email_queue.unfinished_tasks} email(s) undelivered")
+                return False
+            _email_queue.all_tasks_done.wait(remaining)
+    # Sends that failed again during the flush would only be retried after the process is gone
+    with _retry_lock:
+        dropped = [job for _, job in _pending_retries.values()]
+        for timer, _ in _pending_retries.values():
+            timer.cancel()
+        _pending_retries.clear()
+    for to_email, subject, _, _ in dropped:
+        logger.error(f"Email '{subject}' to {to_email} dropped at shutdown with a retry still pending")
+    return not dropped
+
+
+class EmailService:
+    def __init__(self):
+        # Shared Zoho client; credentials are read from the environment once per process
+        self._zoho = _get_zoho_service()
+
+    def _zoho_enabled(self) -> bool:
+        """Whether Zoho is configured; checked before any template is rendered"""
+        return getattr(self._zoho, 'enabled', False)
+
+    def _enqueue(self, to_email: str, subject: str, html_content: str) -> bool:
+        """Hand a rendered email to the background worker; True once it is queued"""
+        _ensure_worker()
+        _email_queue.put((to_email, subject, html_content, 0))
+        return True
+
+    def send_reservation_confirmation(self, reservation: ReservationResponse) -> bool:
+        """Send confirmation email for a new reservation via Zoho"""
+        if not _has_valid_email(reservation):
+            logger.info("Reservation has no valid email; skipping confirmation email.")
+            return False
+        if not self._zoho_enabled():
+            logger.warning("Zoho not configured; skipping confirmation email.")
             return False
 
         try:
-            # Create tokens for cancel/edit links
-            cancel_token = create_reservation_token(reservation.id)
-            edit_token = create_reservation_token(reservation.id)
+            # Cancel and edit links accept the same reservation token, so sign it once
+            token = create_reservation_token(reservation.id)
+            cancel_token = edit_token = token
 
             # We no longer include table names; only room is displayed
 
             subject = f"Reservation Confirmation - The Castle Pub"
             
-            html_content = f"""
-            <html>
-            <body>
-                <div style=\"text-align:center;margin-bottom:20px\">
-                    <img src=\"{settings.FRONTEND_URL}/static/logo.png\" alt=\"The Castle Pub\" style=\"max-height:60px\" />
-                </div>
-                <h2 style=\"font-family:Arial, sans-serif;color:#222\">Reservation Confirmation</h2>
-                <p>Dear {reservation.customer_name},</p>
-                
-                <p>Your reservation has been confirmed at <strong>The Castle Pub</strong>.</p>
-                
-                <h3>Reservation Details:</h3>
-                <ul>
-                    <li><strong>Date:</strong> {reservation.date.strftime('%A, %B %d, %Y')}</li>
-                    <li><strong>Time:</strong> {reservation.time.strftime('%I:%M %p')}</li>
-                    <li><strong>Party Size:</strong> {reservation.party_size} people</li>
-                    <li><strong>Room:</strong> {reservation.room_name}</li>
-                </ul>
-                
-                {f'<p><strong>Special Notes:</strong> {reservation.notes}</p>' if reservation.notes else ''}
-                
-                <h3>Manage Your Reservation:</h3>
-                <p>
-                    <a href="{settings.FRONTEND_URL}/cancel/{cancel_token}" 
-                       style="background-color: #dc3545; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; margin-right: 10px;">
-                        Cancel Reservation
-                    </a>
-                    <a href="{settings.FRONTEND_URL}/edit/{edit_token}" 
-                       style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
-                        Modify Reservation
-                    </a>
-                </p>
-                
-                <p><strong>Important:</strong> Please arrive 5 minutes before your reservation time.</p>
-                
-                <p>If you have any questions, please contact us at {settings.CONTACT_EMAIL}</p>
-                
-                <p>Thank you for choosing The Castle Pub!</p>
-                
-                <hr>
-                <p style="font-size: 12px; color: #666;">
-                    This email was sent to {reservation.email}. 
-                    If you did not make this reservation, please contact us immediately.
-                </p>
-            </body>
-            </html>
-            """
-
-            ok = self._send_via_zoho(reservation.email, subject, html_content)
-            if ok:
-                logger.info(f"Confirmation email sent to {reservation.email}")
-            else:
-                logger.error("Confirmation email failed via Zoho")
+            date_str, time_str = _format_dt(reservation)
+            html_content = _CONFIRMATION_TEMPLATE.render(
+                reservation=reservation,
+                date_str=date_str,
+                time_str=time_str,
+                cancel_token=cancel_token,
+                edit_token=edit_token,
+                frontend_url=settings.FRONTEND_URL,
+                contact_email=settings.CONTACT_EMAIL,
+            )
+
+            ok = self._enqueue(reservation.email, subject, html_content)
+            logger.info(f"Confirmation email queued for {reservation.email}")
             return ok
         except Exception as e:
             logger.error(f"Error sending confirmation email: {str(e)}")
             return False
 
-    def send_reservation_update(self, reservation: ReservationWithTables, changes: str) -> bool:
+    def send_reservation_update(self, reservation: ReservationResponse, changes: str) -> bool:
         """Send update notification email via Zoho"""
+        if not _has_valid_email(reservation):
+            logger.info("Reservation has no valid email; skipping update email.")
+            return False
+        if not self._zoho_enabled():
+            logger.warning("Zoho not configured; skipping update email.")
+            return False
 
         try:
-            subject = f"Reservation Updated - The Castle Pub"
-            
-            html_content = f"""
-            <html>
-            <body>
-                <h2>Reservation Updated</h2>
-                <p>Dear {reservation.customer_name},</p>
-                
-                <p>Your reservation at <strong>The Castle Pub</strong> has been updated.</p>
-                
-                <h3>Updated Reservation Details:</h3>
-                <ul>
-                    <li><strong>Date:</strong> {reservation.date.strftime('%A, %B %d, %Y')}</li>
-                    <li><strong>Time:</strong> {reservation.time.strftime('%I:%M %p')}</li>
-                    <li><strong>Party Size:</strong> {reservation.party_size} people</li>
-                    <li><strong>Room:</strong> {reservation.room_name}</li>
-                </ul>
-                
-                <p><strong>Changes Made:</strong> {changes}</p>
-                
-                <p>If you have any questions, please contact us at {settings.CONTACT_EMAIL}</p>
-                
-                <p>Thank you for choosing The Castle Pub!</p>
-            </body>
-            </html>
-            """
-
-            ok = self._send_via_zoho(reservation.email, subject, html_content)
-            if ok:
-                logger.info(f"Update email sent successfully to {reservation.email}")
-                return True
-            else:
-                logger.error("Failed to send update email via Zoho")
-                return False
+            # Rendered when the debounce window closes, from the latest reservation state
+            _schedule_update(reservation, changes)
+            return True
 
         except Exception as e:
             logger.error(f"Error sending update email: {str(e)}")
             return False
 
-    def send_reservation_cancellation(self, reservation: ReservationWithTables) -> bool:
+    def send_reservation_cancellation(self, reservation: ReservationResponse) -> bool:
         """Send cancellation confirmation email via Zoho"""
+        if not _has_valid_email(reservation):
+            logger.info("Reservation has no valid email; skipping cancellation email.")
+            return False
+        if not self._zoho_enabled():
+            logger.warning("Zoho not configured; skipping cancellation email.")
+            return False
 
         try:
+            # A cancellation supersedes any update still waiting to go out
+            _discard_update(reservation.id)
+
             subject = f"Reservation Cancelled - The Castle Pub"
             
-            html_content = f"""
-            <html>
-            <body>
-                <h2>Reservation Cancelled</h2>
-                <p>Dear {reservation.customer_name},</p>
-                
-                <p>Your reservation at <strong>The Castle Pub</strong> has been cancelled.</p>
-                
-                <h3>Cancelled Reservation Details:</h3>
-                <ul>
-                    <li><strong>Date:</strong> {reservation.date.strftime('%A, %B %d, %Y')}</li>
-                    <li><strong>Time:</strong> {reservation.time.strftime('%I:%M %p')}</li>
-                    <li><strong>Party Size:</strong> {reservation.party_size} people</li>
-                    <li><strong>Room:</strong> {reservation.room_name}</li>
-                </ul>
-                
-                <p>We hope to see you again soon!</p>
-                
-                <p>If you have any questions, please contact us at {settings.CONTACT_EMAIL}</p>
-                
-                <p>Thank you for choosing The Castle Pub!</p>
-            </body>
-            </html>
-            """
-
-            ok = self._send_via_zoho(reservation.email, subject, html_content)
-            if ok:
-                logger.info(f"Cancellation email sent successfully to {reservation.email}")
-                return True
-            else:
-                logger.error("Failed to send cancellation email via Zoho")
-                return False
+            date_str, time_str = _format_dt(reservation)
+            html_content = _CANCELLATION_TEMPLATE.render(
+                reservation=reservation,
+                date_str=date_str,
+                time_str=time_str,
+                contact_email=settings.CONTACT_EMAIL,
+            )
+
+            ok = self._enqueue(reservation.email, subject, html_content)
+            logger.info(f"Cancellation email queued for {reservation.email}")
+            return ok
 
         except Exception as e:
             logger.error(f"Error sending cancellation email: {str(e)}")
@@ -1,15 +1,111 @@
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+from email.message import EmailMessage, MIMEPart
+import base64
 import os
+import threading
+import time
 from typing import Optional, List
 from datetime import datetime
+from jinja2 import Environment
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Idle connections are kept alive with NOOP every SMTP_KEEPALIVE_INTERVAL seconds
+# and closed once unused for SMTP_MAX_IDLE seconds
+SMTP_KEEPALIVE_INTERVAL = 30
+SMTP_MAX_IDLE = 300
+
+# Socket timeout for connecting and every SMTP command, so a stalled server fails the send instead of hanging
+SMTP_TIMEOUT = 20
+
+# Templates are compiled once at import; HTML output is autoescaped, plain text is not
+_html_env = Environment(autoescape=True)
+_text_env = Environment(autoescape=False)
+
+_CONFIRMATION_HTML = _html_env.from_string("""
+    <html>
+    <body>
+        <h2>Reservation Confirmed!</h2>
+        <p>Dear {{ customer_name }},</p>
+        <p>Your reservation at The Castle Pub has been confirmed.</p>
+        
+        <h3>Reservation Details:</h3>
+        <ul>
+            <li><strong>Date:</strong> {{ reservation_data['date'] }}</li>
+            <li><strong>Time:</strong> {{ reservation_data['time'] }}</li>
+            <li><strong>Duration:</strong> {{ reservation_data['duration_hours'] }} hours</li>
+            <li><strong>Party Size:</strong> {{ reservation_data['party_size'] }} people</li>
+            <li><strong>Room:</strong> {{ reservation_data['room_name'] }}</li>
+        </ul>
+        
+        <p>If you need to make any changes to your reservation, please contact us.</p>
+        
+        <p>Thank you for choosing The Castle Pub!</p>
+        
+        <hr>
+        <p><small>This is an automated confirmation email.</small></p>
+    </body>
+    </html>
+    """)
+
+_CONFIRMATION_TEXT = _text_env.from_string("""
+    Reservation Confirmed!
+    
+    Dear {{ customer_name }},
+    
+    Your reservation at The Castle Pub has been confirmed.
+    
+    Reservation Details:
+    - Date: {{ reservation_data['date'] }}
+    - Time: {{ reservation_data['time'] }}
+    - Duration: {{ reservation_data['duration_hours'] }} hours
+    - Party Size: {{ reservation_data['party_size'] }} people
+    - Room: {{ reservation_data['room_name'] }}
+    
+    If you need to make any changes to your reservation, please contact us.
+    
+    Thank you for choosing The Castle Pub!
+    """)
+
+_ADMIN_NOTIFICATION_HTML = _html_env.from_string("""
+    <html>
+    <body>
+        <h2>Admin Notification</h2>
+        <p><strong>Type:</strong> {{ notification_type }}</p>
+        <p><strong>Time:</strong> {{ sent_at }}</p>
+        
+        <h3>Details:</h3>
+        <pre>{{ data }}</pre>
+    </body>
+    </html>
+    """)
+
+
+# 57 raw bytes encode to one 76-character base64 line, so chunks stay line-aligned
+_ATTACHMENT_CHUNK_SIZE = 57 * 1024
+
+
+def _encode_attachment(attachment: dict) -> str:
+    """Base64-encode an attachment given as raw 'data' bytes or a file-like 'stream'"""
+    stream = attachment.get('stream')
+    if stream is None:
+        return base64.encodebytes(attachment['data']).decode('ascii')
+    return ''.join(
+        base64.encodebytes(chunk).decode('ascii')
+        for chunk in iter(lambda: stream.read(_ATTACHMENT_CHUNK_SIZE), b'')
+    )
+
+
+def _attachment_part(attachment: dict) -> MIMEPart:
+    """Attachment MIME part carrying the already-encoded base64 payload, so it is encoded only once"""
+    part = MIMEPart()
+    part['Content-Type'] = 'application/octet-stream'
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', 'attachment', filename=attachment['filename'])
+    part.set_payload(_encode_attachment(attachment))
+    return part
+
 
 class ZohoEmailService:
     def __init__(self):
@@ -26,6 +122,78 @@ class ZohoEmailService:
             self.enabled = False
         else:
             self.enabled = True
+
+        # Persistent SMTP connection reused across sends; guarded by _smtp_lock
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._last_used = 0.0
+        # Pings the open connection while it idles; armed after each send
+        self._keepalive_timer: Optional[threading.Timer] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=SMTP_TIMEOUT)
+        server.starttls()
+        server.login(self.username, self.password)
+        return server
+
+    def _deliver(self, msg: EmailMessage) -> None:
+        """Send over the persistent connection, reconnecting once if the server dropped it"""
+        with self._smtp_lock:
+            try:
+                if self._smtp is None:
+                    self._smtp = self._connect()
+                self._smtp.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = self._connect()
+                self._smtp.send_message(msg)
+            except Exception:
+                # Drop a connection in an unknown state; the next send reconnects
+                self._quit()
+                raise
+            self._last_used = time.monotonic()
+            self._schedule_keepalive()
+
+    def _schedule_keepalive(self) -> None:
+        """Arm the keepalive timer if it is not already pending; caller holds _smtp_lock"""
+        if self._keepalive_timer is None:
+            self._keepalive_timer = threading.Timer(SMTP_KEEPALIVE_INTERVAL, self._keepalive)
+            self._keepalive_timer.daemon = True
+            self._keepalive_timer.start()
+
+    def _keepalive(self) -> None:
+        """Ping an idle connection so Zoho does not time it out; close it after SMTP_MAX_IDLE"""
+        with self._smtp_lock:
+            self._keepalive_timer = None
+            if self._smtp is None:
+                return
+            if time.monotonic() - self._last_used > SMTP_MAX_IDLE:
+                self._quit()
+                return
+            try:
+                code, _ = self._smtp.noop()
+            except Exception:
+                code = None
+            if code != 250:
+                self._quit()
+                return
+            self._schedule_keepalive()
+
+    def _quit(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def close(self) -> None:
+        """Stop the keepalive timer and close the persistent SMTP connection"""
+        with self._smtp_lock:
+            if self._keepalive_timer is not None:
+                self._keepalive_timer.cancel()
+                self._keepalive_timer = None
+            self._quit()
     
     def send_email(
         self,
@@ -43,7 +211,7 @@ class ZohoEmailService:
         
         try:
             # Create message
-            msg = MIMEMultipart('alternative')
+            msg = EmailMessage()
             msg['From'] = self.from_email
             msg['To'] = to_email
             msg['Subject'] = subject
@@ -53,31 +221,21 @@ class ZohoEmailService:
                 except Exception:
                     pass
             
-            # Add text and HTML parts
+            # Plain text first with an HTML alternative, or HTML alone
             if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
-            
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
+                msg.set_content(text_content)
+                msg.add_alternative(html_content, subtype='html')
+            else:
+                msg.set_content(html_content, subtype='html')
             
             # Add attachments if provided
             if attachments:
+                msg.make_mixed()
                 for attachment in attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment['data'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {attachment["filename"]}'
-                    )
-                    msg.attach(part)
+                    msg.attach(_attachment_part(attachment))
             
             # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            self._deliver(msg)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -95,50 +253,9 @@ class ZohoEmailService:
         """Send reservation confirmation email"""
         subject = f"Reservation Confirmed - The Castle Pub"
         
-        html_content = f"""
-        <html>
-        <body>
-            <h2>Reservation Confirmed!</h2>
-            <p>Dear {customer_name},</p>
-            <p>Your reservation at The Castle Pub has been confirmed.</p>
-            
-            <h3>Reservation Details:</h3>
-            <ul>
-                <li><strong>Date:</strong> {reservation_data['date']}</li>
-                <li><strong>Time:</strong> {reservation_data['time']}</li>
-                <li><strong>Duration:</strong> {reservation_data['duration_hours']} hours</li>
-                <li><strong>Party Size:</strong> {reservation_data['party_size']} people</li>
-                <li><strong>Room:</strong> {reservation_data['room_name']}</li>
-            </ul>
-            
-            <p>If you need to make any changes to your reservation, please contact us.</p>
-            
-            <p>Thank you for choosing The Castle Pub!</p>
-            
-            <hr>
-            <p><small>This is an automated confirmation email.</small></p>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Reservation Confirmed!
+        html_content = _CONFIRMATION_HTML.render(customer_name=customer_name, reservation_data=reservation_data)
         
-        Dear {customer_name},
-        
-        Your reservation at The Castle Pub has been confirmed.
-        
-        Reservation Details:
-        - Date: {reservation_data['date']}
-        - Time: {reservation_data['time']}
-        - Duration: {reservation_data['duration_hours']} hours
-        - Party Size: {reservation_data['party_size']} people
-        - Room: {reservation_data['room_name']}
-        
-        If you need to make any changes to your reservation, please contact us.
-        
-        Thank you for choosing The Castle Pub!
-        """
+        text_content = _CONFIRMATION_TEXT.render(customer_name=customer_name, reservation_data=reservation_data)
         
         return self.send_email(customer_email, subject, html_content, text_content)
     
@@ -151,17 +268,10 @@ class ZohoEmailService:
         """Send notification email to admin"""
         subject = f"Admin Notification - {notification_type}"
         
-        html_content = f"""
-        <html>
-        <body>
-            <h2>Admin Notification</h2>
-            <p><strong>Type:</strong> {notification_type}</p>
-            <p><strong>Time:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            
-            <h3>Details:</h3>
-            <pre>{str(data)}</pre>
-        </body>
-        </html>
-        """
+        html_content = _ADMIN_NOTIFICATION_HTML.render(
+            notification_type=notification_type,
+            sent_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            data=str(data),
+        )
         
         return self.send_email(admin_email, subject, html_content) 
\ No newline at end of file
@@ -1,27 +1,156 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, contains_eager, raiseload
+from sqlalchemy import func, lambda_stmt, select, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Dict, Any, Tuple
 from app.models.table_layout import TableLayout, RoomLayout, TableShape
 from app.models.table import Table
-from app.models.room import Room
-from app.models.reservation import Reservation
+from app.core.config import settings
+from app.models.reservation import Reservation, ReservationTable
 from app.schemas.layout import (
-    TableLayoutCreate, TableLayoutUpdate, TableLayoutResponse,
+    TableLayoutCreate, TableLayoutUpdate,
     RoomLayoutCreate, RoomLayoutUpdate, RoomLayoutResponse,
-    LayoutEditorData, TableWithReservation
+    LayoutEditorData, TableWithReservation, ReservationSummary
 )
 from datetime import datetime, date
-import json
+from collections import OrderedDict, defaultdict
+import csv
+import functools
+import hashlib
+import io
+import math
+import threading
+import time
+import uuid
+import orjson
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# TableLayoutCreate fields that map directly onto TableLayout columns
+_TABLE_LAYOUT_FIELDS = (
+    "table_id", "room_id", "x_position", "y_position", "width", "height",
+    "shape", "color", "border_color", "text_color", "show_capacity", "show_name",
+    "font_size", "custom_capacity", "is_connected", "connected_to", "z_index",
+)
+
+# Schema defaults for nullable TableLayout columns; NULLs are replaced before the
+# unvalidated TableWithReservation.model_construct in the editor build
+_TABLE_LAYOUT_NULL_DEFAULTS = {
+    "width": 100.0,
+    "height": 80.0,
+    "color": "#4A90E2",
+    "border_color": "#2E5BBA",
+    "text_color": "#FFFFFF",
+    "show_capacity": True,
+    "show_name": True,
+    "font_size": 12,
+    "is_connected": False,
+    "z_index": 1,
+}
+
+# Columns included in export_room_layout payloads
+_EXPORT_ROOM_FIELDS = (
+    "width", "height", "background_color", "grid_enabled", "grid_size", "grid_color",
+    "show_entrance", "entrance_position", "show_bar", "bar_position",
+)
+_EXPORT_TABLE_FIELDS = (
+    "table_id", "x_position", "y_position", "width", "height", "shape", "color",
+    "border_color", "text_color", "show_capacity", "show_name", "font_size",
+    "custom_capacity", "is_connected", "connected_to", "z_index",
+)
+
+# room_id -> (layout version stamp, export payload, encoded payload, timestamp); shared across
+# requests, LRU order, bounded and expired like the editor cache so a missed stamp cannot live forever
+_export_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_EXPORT_CACHE_LOCK = threading.Lock()
+_EXPORT_CACHE_MAX_ENTRIES = 64
+_EXPORT_CACHE_TTL = 300  # 5 minutes TTL
+
+
+# Layout editor cache shared by all LayoutService instances (one is built per request).
+# LRU order: least recently used first. Entries are (data, timestamp, room_id, hits, version);
+# a hit also requires the stored data version to match the current one.
+_LAYOUT_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_LAYOUT_ROOM_KEYS: Dict[str, set] = defaultdict(set)  # room_id -> cache keys
+_LAYOUT_LOCK = threading.RLock()
+_LAYOUT_CACHE_MAX_ENTRIES = 128
+_LAYOUT_CACHE_TTL = 300  # 5 minutes TTL
+
+@functools.lru_cache(maxsize=1)
+def _get_redis():
+    """Process-wide Redis client for the layout cache, or None when disabled or unavailable"""
+    if not settings.LAYOUT_CACHE_REDIS:
+        return None
+    try:
+        import redis
+        return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Redis layout cache unavailable: {e}")
+        return None
+
+
+# Effective seating capacity of a laid-out table
+_SUGGEST_CAPACITY = func.coalesce(TableLayout.custom_capacity, Table.capacity)
+
+
+def _suggest_stmt(room_id: str, party_size: int, target_date: date, target_time) -> StatementLambdaElement:
+    """Table suggestion query as a lambda statement; its construction and SQL are cached after the first call"""
+    return lambda_stmt(lambda: select(
+        Table.id, Table.name, TableLayout.id, _SUGGEST_CAPACITY,
+        TableLayout.x_position, TableLayout.y_position, TableLayout.shape
+    ).select_from(TableLayout).join(
+        Table, TableLayout.table_id == Table.id
+    ).where(
+        TableLayout.room_id == room_id,
+        # Tables already booked for the time slot, matched by id straight off reservation_tables
+        ~Table.id.in_(
+            select(ReservationTable.table_id).join(
+                Reservation, Reservation.id == ReservationTable.reservation_id
+            ).where(
+                Reservation.date == target_date,
+                Reservation.time == target_time
+            )
+        ),
+        _SUGGEST_CAPACITY >= party_size
+    # Free tables that fit the party, best fit first; the database returns only the top 5
+    ).order_by(_SUGGEST_CAPACITY - party_size).limit(5))
+
+
+def _editor_reservations_stmt(room_id: str, target_date: date) -> StatementLambdaElement:
+    """Reservations on target_date with the active room table each is assigned to, as a cached lambda statement"""
+    # Filtering through the tables join keeps the SQL text fixed instead of growing an IN list per table
+    stmt = lambda_stmt(lambda: select(Reservation, ReservationTable.table_id).join(
+        ReservationTable, ReservationTable.reservation_id == Reservation.id
+    ).join(
+        Table, Table.id == ReservationTable.table_id
+    ).where(
+        Table.room_id == room_id,
+        Table.active == True,
+        Reservation.date == target_date
+    ))
+    if settings.SQL_RAISELOAD:
+        stmt += lambda s: s.options(raiseload("*"))
+    return stmt
 
 
 class LayoutService:
     def __init__(self, db: Session):
         self.db = db
-        self._cache = {}  # Simple in-memory cache
-        self._cache_ttl = 300  # 5 minutes TTL
+        self._redis = _get_redis()  # None unless the shared Redis layout cache is enabled
+        self._room_layouts: Dict[str, RoomLayout] = {}  # per-request memo for get_room_layout
+
+    def _query(self, *entities):
+        """ORM query for entities; with SQL_RAISELOAD unloaded relationships raise instead of lazy-loading"""
+        query = self.db.query(*entities)
+        if settings.SQL_RAISELOAD:
+            query = query.options(raiseload("*"))
+        return query
 
     # Table Layout Management
-    def create_table_layout(self, layout_data: TableLayoutCreate) -> TableLayout:
+    def create_table_layout(self, layout_data: TableLayoutCreate, flush_only: bool = False) -> TableLayout:
         """Create a new table layout. If table_id is not provided, create a Table first."""
         # If table_id is missing, create a new Table record using provided optional fields
         table_id = layout_data.table_id
@@ -60,27 +189,21 @@ class LayoutService:
             z_index=layout_data.z_index
         )
         self.db.add(layout)
-        self.db.commit()
-        self.db.refresh(layout)
+        self._save(layout, flush_only)
 
         # Clear cache for this room
         self._clear_room_cache(layout_data.room_id)
 
         return layout
 
-    def update_table_layout(self, layout_id: str, layout_data: TableLayoutUpdate) -> Optional[TableLayout]:
+    def update_table_layout(self, layout_id: str, layout_data: TableLayoutUpdate, flush_only: bool = False) -> Optional[TableLayout]:
         """Update an existing table layout"""
-        layout = self.db.query(TableLayout).filter(TableLayout.id == layout_id).first()
+        layout = self._update_returning(
+            TableLayout, TableLayout.id == layout_id, layout_data, flush_only
+        )
         if not layout:
             return None
         
-        for field, value in layout_data.dict(exclude_unset=True).items():
-            setattr(layout, field, value)
-        
-        layout.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(layout)
-        
         # Clear cache for this room
         self._clear_room_cache(layout.room_id)
         
@@ -103,14 +226,14 @@ class LayoutService:
 
     def get_table_layout(self, layout_id: str) -> Optional[TableLayout]:
         """Get a specific table layout"""
-        return self.db.query(TableLayout).filter(TableLayout.id == layout_id).first()
+        return self._query(TableLayout).filter(TableLayout.id == layout_id).first()
 
     def get_table_layouts_by_room(self, room_id: str) -> List[TableLayout]:
         """Get all table layouts for a specific room"""
-        return self.db.query(TableLayout).filter(TableLayout.room_id == room_id).all()
+        return self._query(TableLayout).filter(TableLayout.room_id == room_id).all()
 
     # Room Layout Management
-    def create_room_layout(self, layout_data: RoomLayoutCreate) -> RoomLayout:
+    def create_room_layout(self, layout_data: RoomLayoutCreate, flush_only: bool = False) -> RoomLayout:
         """Create a new room layout"""
         layout = RoomLayout(
             room_id=layout_data.room_id,
@@ -126,61 +249,272 @@ class LayoutService:
             bar_position=layout_data.bar_position
         )
         self.db.add(layout)
-        self.db.commit()
-        self.db.refresh(layout)
+        self._save(layout, flush_only)
+        self._room_layouts[layout.room_id] = layout
         return layout
 
-    def update_room_layout(self, room_id: str, layout_data: RoomLayoutUpdate) -> Optional[RoomLayout]:
+    def update_room_layout(self, room_id: str, layout_data: RoomLayoutUpdate, flush_only: bool = False) -> Optional[RoomLayout]:
         """Update an existing room layout"""
-        layout = self.db.query(RoomLayout).filter(RoomLayout.room_id == room_id).first()
-        if not layout:
-            return None
-        
-        for field, value in layout_data.dict(exclude_unset=True).items():
-            setattr(layout, field, value)
-        
-        layout.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(layout)
+        self._room_layouts.pop(room_id, None)
+        return self._update_returning(
+            RoomLayout, RoomLayout.room_id == room_id, layout_data, flush_only
+        )
+
+    def _update_returning(self, model, criterion, layout_data, flush_only: bool):
+        """UPDATE ... RETURNING the mapped entity, so the updated row comes back without a follow-up SELECT"""
+        stmt = (
+            update(model)
+            .where(criterion)
+            # Stamp with the database clock, like created_at and the column onupdate defaults,
+            # so the max(updated_at) version used for ETags and caches always moves forward
+            .values(**layout_data.model_dump(exclude_unset=True), updated_at=func.now())
+            .returning(model)
+            # Returned values also refresh any copy of the row already in the session
+            .execution_options(synchronize_session="fetch")
+        )
+        layout = self.db.execute(stmt).scalar_one_or_none()
+        if flush_only:
+            self.db.flush()
+        else:
+            self.db.commit()
         return layout
 
+    def _save(self, instance, flush_only: bool):
+        """Commit and refresh, or only flush when the caller owns the transaction"""
+        if flush_only:
+            self.db.flush()
+        else:
+            self.db.commit()
+            self.db.refresh(instance)
+
     def get_room_layout(self, room_id: str) -> Optional[RoomLayout]:
         """Get room layout for a specific room"""
-        return self.db.query(RoomLayout).filter(RoomLayout.room_id == room_id).first()
+        layout = self._room_layouts.get(room_id)
+        if layout is None:
+            layout = self._query(RoomLayout).filter(RoomLayout.room_id == room_id).first()
+            if layout is not None:
+                self._room_layouts[room_id] = layout
+        return layout
 
     # Layout Editor Data
     def _get_cache_key(self, room_id: str, target_date: date) -> str:
         """Generate cache key for layout data"""
         return f"layout_editor_{room_id}_{target_date}"
     
-    def _get_from_cache(self, key: str):
-        """Get data from cache if not expired"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if (datetime.utcnow() - timestamp).seconds < self._cache_ttl:
+    @staticmethod
+    def _get_from_cache(key: str, version: tuple):
+        """Get data from cache if not expired and still at the given data version"""
+        with _LAYOUT_LOCK:
+            entry = _LAYOUT_CACHE.get(key)
+            if entry is None:
+                return None
+            data, timestamp, room_id, hits, cached_version = entry
+            if cached_version == version and time.monotonic() - timestamp < LayoutService._effective_ttl():
+                _LAYOUT_CACHE[key] = (data, timestamp, room_id, hits + 1, cached_version)
+                _LAYOUT_CACHE.move_to_end(key)
                 return data
-            else:
-                del self._cache[key]
-        return None
+            LayoutService._evict(key)
+            return None
+    
+    @staticmethod
+    def _effective_ttl() -> float:
+        """TTL shrunk under memory pressure: full below 70% occupancy, down to 10% of it when nearly full"""
+        pressure = (len(_LAYOUT_CACHE) - 0.7 * _LAYOUT_CACHE_MAX_ENTRIES) / (0.2 * _LAYOUT_CACHE_MAX_ENTRIES)
+        return _LAYOUT_CACHE_TTL * (1 - min(max(pressure, 0.0), 0.9))
     
-    def _set_cache(self, key: str, data):
-        """Set data in cache with timestamp"""
-        self._cache[key] = (data, datetime.utcnow())
+    @staticmethod
+    def _set_cache(key: str, data, room_id: str, version: tuple):
+        """Set data in cache with timestamp, evicting an entry first when full"""
+        with _LAYOUT_LOCK:
+            if key not in _LAYOUT_CACHE and len(_LAYOUT_CACHE) >= _LAYOUT_CACHE_MAX_ENTRIES:
+                LayoutService._maybe_evict()
+            _LAYOUT_CACHE[key] = (data, time.monotonic(), room_id, 0, version)
+            _LAYOUT_CACHE.move_to_end(key)
+            _LAYOUT_ROOM_KEYS[room_id].add(key)
+    
+    @staticmethod
+    def _maybe_evict():
+        """Sweep expired entries; if still full, drop the weakest of the least recently used 10%"""
+        now = time.monotonic()
+        ttl = LayoutService._effective_ttl()
+        for key in [k for k, entry in _LAYOUT_CACHE.items() if now - entry[1] >= ttl]:
+            LayoutService._evict(key)
+        if len(_LAYOUT_CACHE) < _LAYOUT_CACHE_MAX_ENTRIES:
+            return
+        # Score = log(hits + 1) + recency, recency rising from 0 (oldest) towards 1 across the window
+        window = max(1, len(_LAYOUT_CACHE) // 10)
+        candidates = []
+        for position, (key, entry) in enumerate(_LAYOUT_CACHE.items()):
+            if position >= window:
+                break
+            candidates.append((math.log(entry[3] + 1) + position / window, key))
+        LayoutService._evict(min(candidates)[1])
+    
+    @staticmethod
+    def _evict(key: str):
+        """Drop one cache entry and its room index reference (caller holds the lock)"""
+        room_id = _LAYOUT_CACHE.pop(key)[2]
+        keys = _LAYOUT_ROOM_KEYS.get(room_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del _LAYOUT_ROOM_KEYS[room_id]
     
     def _clear_room_cache(self, room_id: str):
         """Clear cache for a specific room"""
-        keys_to_remove = [key for key in self._cache.keys() if f"layout_editor_{room_id}_" in key]
-        for key in keys_to_remove:
-            del self._cache[key]
+        with _LAYOUT_LOCK:
+            for key in _LAYOUT_ROOM_KEYS.pop(room_id, ()):
+                _LAYOUT_CACHE.pop(key, None)
+        with _EXPORT_CACHE_LOCK:
+            _export_cache.pop(room_id, None)
+        self._redis_clear_room(room_id)
+    
+    def _editor_version(self, room_id: str, target_date: date) -> tuple:
+        """Cheap data version for a room/date: layout, table and reservation assignment change stamps"""
+        table_changed = func.coalesce(Table.updated_at, Table.created_at)
+        reservation_changed = func.coalesce(Reservation.updated_at, Reservation.created_at)
+        day_assignments = select(
+            ReservationTable.id
+        ).join(
+            Reservation, Reservation.id == ReservationTable.reservation_id
+        ).join(
+            Table, Table.id == ReservationTable.table_id
+        ).where(
+            Table.room_id == room_id,
+            Reservation.date == target_date
+        ).subquery()
+        return tuple(self.db.query(
+            *self._layout_version_columns(room_id),
+            select(func.max(table_changed)).where(Table.room_id == room_id).scalar_subquery(),
+            select(func.count(Table.id)).where(Table.room_id == room_id).scalar_subquery(),
+            select(func.count()).select_from(day_assignments).scalar_subquery(),
+            select(func.max(ReservationTable.created_at)).where(
+                ReservationTable.id.in_(select(day_assignments.c.id))
+            ).scalar_subquery(),
+            select(func.max(reservation_changed)).where(
+                Reservation.room_id == room_id,
+                Reservation.date == target_date
+            ).scalar_subquery(),
+        ).one())
     
+    @staticmethod
+    def _version_token(version: tuple) -> str:
+        return hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+
+    def get_layout_version(self, room_id: str, target_date: date) -> str:
+        """Short opaque token for the editor data of a room/date, usable as an HTTP ETag"""
+        return self._version_token(self._editor_version(room_id, target_date))
+
+    def _tables_with_layouts(self, room_id: str, refresh: bool = False) -> List[Table]:
+        """Active tables of a room with Table.layout populated from the same query"""
+        query = self._query(Table)
+        if refresh:
+            query = query.populate_existing()
+        return query.outerjoin(
+            TableLayout, TableLayout.table_id == Table.id
+        ).options(
+            contains_eager(Table.layout)
+        ).filter(
+            Table.room_id == room_id,
+            Table.active == True
+        ).all()
+
+    def _insert_missing_layouts(self, rows: List[Dict[str, Any]]):
+        """One batched INSERT ... ON CONFLICT (table_id) DO NOTHING, so concurrent first opens don't collide"""
+        if self.db.get_bind().dialect.name == "sqlite":
+            stmt = sqlite_insert(TableLayout)
+        else:
+            stmt = pg_insert(TableLayout)
+        self.db.execute(stmt.on_conflict_do_nothing(index_elements=["table_id"]), rows)
+
     def get_layout_editor_data(self, room_id: str, target_date: date) -> LayoutEditorData:
         """Get comprehensive data for the layout editor"""
-        # Check cache first
+        return LayoutEditorData.model_validate(self.get_layout_editor_data_raw(room_id, target_date))
+
+    def get_layout_editor_data_raw(self, room_id: str, target_date: date) -> Dict[str, Any]:
+        """Layout editor data as a JSON-ready dict; cached so hits skip model validation"""
+        data, _ = self._editor_data_for_version(room_id, target_date, self._editor_version(room_id, target_date))
+        return data
+
+    def get_layout_editor_data_conditional(
+        self, room_id: str, target_date: date, if_none_match: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Editor data plus its quoted ETag; data is None when if_none_match is still current"""
+        version = self._editor_version(room_id, target_date)
+        etag = f'"{self._version_token(version)}"'
+        if if_none_match == etag:
+            return None, etag
+        data, built_version = self._editor_data_for_version(room_id, target_date, version)
+        if built_version != version:
+            etag = f'"{self._version_token(built_version)}"'
+        return data, etag
+
+    def _editor_data_for_version(self, room_id: str, target_date: date, version: tuple) -> Tuple[Dict[str, Any], tuple]:
+        """Cached or freshly built editor data for an already-probed version, with the version it is stamped with"""
         cache_key = self._get_cache_key(room_id, target_date)
-        cached_data = self._get_from_cache(cache_key)
+        cached_data = self._get_from_cache(cache_key, version)
         if cached_data:
-            return cached_data
-        
+            return cached_data, version
+
+        # Another worker may already have built this version
+        cached_data = self._redis_get(cache_key, version)
+        if cached_data:
+            self._set_cache(cache_key, cached_data, room_id, version)
+            return cached_data, version
+
+        result, wrote_defaults = self._build_layout_editor_data(room_id, target_date)
+        data = result.model_dump(mode="json")
+        # Default layouts created by the build move the version; only then is it probed again
+        if wrote_defaults:
+            version = self._editor_version(room_id, target_date)
+        self._set_cache(cache_key, data, room_id, version)
+        self._redis_set(cache_key, data, room_id, version)
+        return data, version
+
+    # Redis tier: versioned keys, so stale data is never read; a per-room set allows explicit clears
+    @staticmethod
+    def _redis_key(cache_key: str, version: tuple) -> str:
+        return f"{cache_key}:{LayoutService._version_token(version)}"
+
+    def _redis_get(self, cache_key: str, version: tuple) -> Optional[Dict[str, Any]]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(self._redis_key(cache_key, version))
+        except Exception as e:
+            logger.warning(f"Layout cache read from Redis failed: {e}")
+            return None
+        return orjson.loads(payload) if payload else None
+
+    def _redis_set(self, cache_key: str, data: Dict[str, Any], room_id: str, version: tuple):
+        if self._redis is None:
+            return
+        key = self._redis_key(cache_key, version)
+        room_keys = f"layout_editor_keys_{room_id}"
+        try:
+            pipe = self._redis.pipeline()
+            pipe.set(key, orjson.dumps(data), ex=_LAYOUT_CACHE_TTL)
+            pipe.sadd(room_keys, key)
+            pipe.expire(room_keys, _LAYOUT_CACHE_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Layout cache write to Redis failed: {e}")
+
+    def _redis_clear_room(self, room_id: str):
+        if self._redis is None:
+            return
+        room_keys = f"layout_editor_keys_{room_id}"
+        try:
+            keys = self._redis.smembers(room_keys)
+            self._redis.delete(room_keys, *keys)
+        except Exception as e:
+            logger.warning(f"Layout cache clear in Redis failed: {e}")
+
+    def _build_layout_editor_data(self, room_id: str, target_date: date) -> Tuple[LayoutEditorData, bool]:
+        """Load and assemble layout editor data from the database; also reports whether defaults were written"""
+        # Defaults created below are flushed into the open transaction and committed once at the end
+        pending_commit = False
+
         # Get room layout
         room_layout = self.get_room_layout(room_id)
         if not room_layout:
@@ -189,295 +523,263 @@ class LayoutService:
                 room_id=room_id,
                 width=1400.0,
                 height=900.0
-            ))
+            ), flush_only=True)
+            pending_commit = True
 
-        # Get all tables for this room
-        tables = self.db.query(Table).filter(
-            Table.room_id == room_id,
-            Table.active == True
-        ).all()
+        # Get all active tables for this room with their layouts in one query
+        tables = self._tables_with_layouts(room_id)
 
         # Ensure each table has a layout; create defaults for missing ones in a grid
-        existing_layouts = self.db.query(TableLayout).filter(TableLayout.room_id == room_id).all()
-        layouts_by_table_id = {l.table_id: l for l in existing_layouts}
+        layouts_by_table_id = {t.id: t.layout for t in tables if t.layout is not None}
+        needs_reload = False
         if tables:
             default_width = 100.0
             default_height = 80.0
             spacing_x = 30.0
             spacing_y = 30.0
             columns = 10
-            index = 0
             # continue after existing layouts count for consistent positioning
-            start_index = len(existing_layouts)
-            for table in tables:
-                if table.id not in layouts_by_table_id:
-                    total_index = start_index + index
-                    col = total_index % columns
-                    row = total_index // columns
-                    x_pos = 25 + col * (default_width + spacing_x)
-                    y_pos = 25 + row * (default_height + spacing_y)
-                    layout = TableLayout(
-                        table_id=str(table.id),
-                        room_id=room_id,
-                        x_position=x_pos,
-                        y_position=y_pos,
-                        width=default_width,
-                        height=default_height,
-                        shape=TableShape.RECTANGULAR,
-                        color="#4A90E2",
-                        border_color="#2E5BBA",
-                        text_color="#FFFFFF",
-                        show_capacity=True,
-                        show_name=True,
-                        font_size=12,
-                        custom_capacity=None,
-                        is_connected=False,
-                        connected_to=None,
-                        z_index=1,
-                    )
-                    self.db.add(layout)
-                    index += 1
-            if index > 0:
-                self.db.commit()
+            start_index = len(layouts_by_table_id)
+            missing = [table for table in tables if table.id not in layouts_by_table_id]
+            step_x = default_width + spacing_x
+            step_y = default_height + spacing_y
+            defaults = dict(
+                room_id=room_id,
+                width=default_width,
+                height=default_height,
+                shape=TableShape.RECTANGULAR,
+                color="#4A90E2",
+                border_color="#2E5BBA",
+                text_color="#FFFFFF",
+                show_capacity=True,
+                show_name=True,
+                font_size=12,
+                custom_capacity=None,
+                is_connected=False,
+                connected_to=None,
+                z_index=1,
+            )
+            new_layouts = []
+            for total_index, table in enumerate(missing, start_index):
+                row, col = divmod(total_index, columns)
+                new_layouts.append({
+                    **defaults,
+                    "table_id": str(table.id),
+                    "x_position": 25 + col * step_x,
+                    "y_position": 25 + row * step_y,
+                })
+            if new_layouts:
+                self._insert_missing_layouts(new_layouts)
+                needs_reload = pending_commit = True
 
             # Auto-expand room canvas to fit all tables
             total_tables = len(tables)
             if total_tables > 0:
-                import math
                 rows_needed = math.ceil(total_tables / columns)
                 required_width = 25 + columns * (default_width + spacing_x) - spacing_x + 25
                 required_height = 25 + rows_needed * (default_height + spacing_y) - spacing_y + 25
-                updated = False
                 if room_layout.width < required_width:
                     room_layout.width = float(required_width)
-                    updated = True
+                    pending_commit = True
                 if room_layout.height < required_height:
                     room_layout.height = float(required_height)
-                    updated = True
-                if updated:
-                    self.db.commit()
+                    pending_commit = True
 
-        # Get table layouts with table data (now guaranteed to exist for all tables)
-        table_layouts = self.db.query(TableLayout, Table).join(Table).filter(
-            TableLayout.room_id == room_id
-        ).all()
+        # Pick up the inserted layouts in the same transaction; populate_existing
+        # overwrites the empty Table.layout already loaded above
+        if needs_reload:
+            tables = self._tables_with_layouts(room_id, refresh=True)
 
-        # Create a map of table_id to layout
-        layout_map = {table.id: layout for layout, table in table_layouts}
-        
-        # Get table names for this room to filter reservations efficiently
-        room_table_names = [table.name for table in tables]
-        
-        # Get reservations for the target date that are assigned to tables in this room
-        from app.models.reservation import ReservationTable
-        
-        # Get table IDs for this room
-        room_table_ids = [table.id for table in tables]
-        
-        # Get reservations that have table assignments in this room
+        # One joined query yields each reservation with the room table it is assigned to;
+        # a reservation spanning several tables comes back once per table
         reservations = []
-        if room_table_ids:
-            reservation_ids = self.db.query(ReservationTable.reservation_id).filter(
-                ReservationTable.table_id.in_(room_table_ids)
-            ).distinct().all()
-            
-            if reservation_ids:
-                reservation_ids = [r[0] for r in reservation_ids]
-                reservations = self.db.query(Reservation).filter(
-                    and_(
-                        Reservation.date == target_date,
-                        Reservation.id.in_(reservation_ids)
-                    )
-                ).all()
+        reservations_by_table = defaultdict(list)
+        if tables:
+            rows = self.db.execute(_editor_reservations_stmt(room_id, target_date)).all()
+
+            # Validate each reservation once; tables share the resulting summaries
+            res_by_id = {}
+            for reservation, table_id in rows:
+                summary = res_by_id.get(reservation.id)
+                if summary is None:
+                    summary = res_by_id[reservation.id] = ReservationSummary.model_validate(reservation)
+                reservations_by_table[table_id].append(summary)
+            reservations = list(res_by_id.values())
 
         # Create table with reservation data
         tables_with_reservations = []
         for table in tables:
-            # Get or create layout for this table
-            layout = layout_map.get(table.id)
-            if not layout:
-                # Create default layout for this table
-                layout = self.create_table_layout(TableLayoutCreate(
-                    table_id=table.id,
-                    room_id=room_id,
-                    x_position=100 + (len(tables_with_reservations) * 150),
-                    y_position=100,
-                    width=120,
-                    height=80,
-                    shape="rectangular",
-                    color="#ffffff",
-                    border_color="#333333",
-                    text_color="#000000",
-                    show_capacity=True,
-                    show_name=True,
-                    font_size=12,
-                    custom_capacity=table.capacity,
-                    z_index=len(tables_with_reservations)
-                ))
+            # Every active table has a layout here: missing ones were inserted above
+            # (ON CONFLICT keeps a concurrent insert) and loaded by the reload
+            layout = table.layout
             
             # Find reservations for this table
-            table_reservations = []
-            for reservation in reservations:
-                # Check if this reservation is assigned to this table
-                table_assignment = self.db.query(ReservationTable).filter(
-                    and_(
-                        ReservationTable.reservation_id == reservation.id,
-                        ReservationTable.table_id == table.id
-                    )
-                ).first()
-                if table_assignment:
-                    table_reservations.append(reservation)
+            table_reservations = reservations_by_table.get(table.id, [])
             
-            table_with_reservation = TableWithReservation(
+            # Skip re-validation per table: nullable columns fall back to their defaults and the
+            # ORM enum is passed by value, so the payload matches what validation would produce
+            visual = {
+                field: default if (value := getattr(layout, field)) is None else value
+                for field, default in _TABLE_LAYOUT_NULL_DEFAULTS.items()
+            }
+            table_with_reservation = TableWithReservation.model_construct(
                 layout_id=layout.id,
                 table_id=table.id,
                 table_name=table.name,
                 capacity=layout.custom_capacity or table.capacity,
                 x_position=layout.x_position,
                 y_position=layout.y_position,
-                width=layout.width,
-                height=layout.height,
-                shape=layout.shape,
-                color=layout.color,
-                border_color=layout.border_color,
-                text_color=layout.text_color,
-                show_capacity=layout.show_capacity,
-                show_name=layout.show_name,
-                font_size=layout.font_size,
-                is_connected=layout.is_connected,
+                shape=layout.shape.value,
                 connected_to=layout.connected_to,
-                z_index=layout.z_index,
-                reservations=table_reservations
+                reservations=table_reservations,
+                **visual
             )
             tables_with_reservations.append(table_with_reservation)
 
-        result = LayoutEditorData(
+        result = LayoutEditorData.model_construct(
             room_id=room_id,
-            room_layout=room_layout,
+            room_layout=RoomLayoutResponse.model_validate(room_layout),
             tables=tables_with_reservations,
             reservations=reservations
         )
-        
-        # Cache the result
-        self._set_cache(cache_key, result)
-        
-        return result
+        if pending_commit:
+            self.db.commit()
+        return result, pending_commit
 
     # Smart Table Assignment
     def suggest_table_assignment(self, room_id: str, party_size: int, target_date: date, target_time: str) -> List[Dict[str, Any]]:
         """Suggest optimal table assignments for a reservation"""
-        # Get available tables for the room
-        table_layouts = self.get_table_layouts_by_room(room_id)
-        
-        # Get existing reservations for the time slot
-        existing_reservations = self.db.query(Reservation).filter(
-            and_(
-                Reservation.date == target_date,
-                Reservation.time == target_time
-            )
-        ).all()
-        
-        # Get reserved table names
-        reserved_tables = set()
-        for reservation in existing_reservations:
-            # Get table assignments for this reservation
-            table_assignments = self.db.query(ReservationTable).filter(
-                ReservationTable.reservation_id == reservation.id
-            ).all()
-            for assignment in table_assignments:
-                table = self.db.query(Table).filter(Table.id == assignment.table_id).first()
-                if table:
-                    reserved_tables.add(table.name)
-        
-        suggestions = []
-        for layout in table_layouts:
-            table = layout.table
-            if table.name in reserved_tables:
-                continue
-            
-            # Check if table capacity matches party size
-            capacity = layout.custom_capacity or table.capacity
-            if capacity >= party_size:
-                suggestions.append({
-                    "table_id": table.id,
-                    "table_name": table.name,
-                    "layout_id": layout.id,
-                    "capacity": capacity,
-                    "x_position": layout.x_position,
-                    "y_position": layout.y_position,
-                    "shape": layout.shape,
-                    "score": capacity - party_size  # Lower score is better (closer fit)
-                })
-        
-        # Sort by score (best fit first)
-        suggestions.sort(key=lambda x: x["score"])
-        return suggestions[:5]  # Return top 5 suggestions
+        rows = self.db.execute(_suggest_stmt(room_id, party_size, target_date, target_time)).all()
+
+        return [
+            {
+                "table_id": table_id,
+                "table_name": table_name,
+                "layout_id": layout_id,
+                "capacity": table_capacity,
+                "x_position": x_position,
+                "y_position": y_position,
+                "shape": shape,
+                "score": table_capacity - party_size  # Lower score is better (closer fit)
+            }
+            for table_id, table_name, layout_id, table_capacity, x_position, y_position, shape in rows
+        ]
 
     # Export/Import
+    @staticmethod
+    def _layout_version_columns(room_id: str) -> tuple:
+        """Scalar subqueries stamping a room's layout: latest change time plus table layout count"""
+        table_changed = func.coalesce(TableLayout.updated_at, TableLayout.created_at)
+        room_changed = func.coalesce(RoomLayout.updated_at, RoomLayout.created_at)
+        return (
+            select(func.max(table_changed)).where(TableLayout.room_id == room_id).scalar_subquery(),
+            select(func.count(TableLayout.id)).where(TableLayout.room_id == room_id).scalar_subquery(),
+            select(func.max(room_changed)).where(RoomLayout.room_id == room_id).scalar_subquery(),
+        )
+
+    def _layout_version(self, room_id: str) -> tuple:
+        """Cheap version stamp for a room's layout"""
+        return tuple(self.db.query(*self._layout_version_columns(room_id)).one())
+
     def export_room_layout(self, room_id: str) -> Dict[str, Any]:
         """Export room layout as JSON"""
-        room_layout = self.get_room_layout(room_id)
-        table_layouts = self.get_table_layouts_by_room(room_id)
-        
-        return {
-            "room_id": room_id,
-            "exported_at": datetime.utcnow().isoformat(),
-            "room_layout": {
-                "width": room_layout.width,
-                "height": room_layout.height,
-                "background_color": room_layout.background_color,
-                "grid_enabled": room_layout.grid_enabled,
-                "grid_size": room_layout.grid_size,
-                "grid_color": room_layout.grid_color,
-                "show_entrance": room_layout.show_entrance,
-                "entrance_position": room_layout.entrance_position,
-                "show_bar": room_layout.show_bar,
-                "bar_position": room_layout.bar_position
-            },
+        export, _ = self._cached_export(room_id)
+        return {"room_id": room_id, "exported_at": datetime.utcnow().isoformat(), **export}
+
+    def export_room_layout_bytes(self, room_id: str) -> bytes:
+        """Export room layout as a ready JSON body; the layout part is encoded once per version"""
+        _, body = self._cached_export(room_id)
+        header = orjson.dumps({"room_id": room_id, "exported_at": datetime.utcnow().isoformat()})
+        return header[:-1] + b"," + body[1:]
+
+    def _cached_export(self, room_id: str) -> tuple:
+        """(layout dict, its orjson encoding) for the room, rebuilt only when the layout version changes"""
+        version = self._layout_version(room_id)
+        with _EXPORT_CACHE_LOCK:
+            cached = _export_cache.get(room_id)
+            if cached and cached[0] == version and time.monotonic() - cached[3] < _EXPORT_CACHE_TTL:
+                _export_cache.move_to_end(room_id)
+                return cached[1], cached[2]
+
+        # Exports only read columns, so fetch plain rows instead of ORM entities
+        room_layout = self.db.execute(
+            select(*(getattr(RoomLayout, field) for field in _EXPORT_ROOM_FIELDS)).where(RoomLayout.room_id == room_id)
+        ).one()
+        table_layouts = self.db.execute(
+            select(*(getattr(TableLayout, field) for field in _EXPORT_TABLE_FIELDS)).where(TableLayout.room_id == room_id)
+        ).all()
+
+        export = {
+            "room_layout": room_layout._asdict(),
             "table_layouts": [
-                {
-                    "table_id": layout.table_id,
-                    "x_position": layout.x_position,
-                    "y_position": layout.y_position,
-                    "width": layout.width,
-                    "height": layout.height,
-                    "shape": layout.shape.value,
-                    "color": layout.color,
-                    "border_color": layout.border_color,
-                    "text_color": layout.text_color,
-                    "show_capacity": layout.show_capacity,
-                    "show_name": layout.show_name,
-                    "font_size": layout.font_size,
-                    "custom_capacity": layout.custom_capacity,
-                    "is_connected": layout.is_connected,
-                    "connected_to": layout.connected_to,
-                    "z_index": layout.z_index
-                }
+                {**layout._asdict(), "shape": layout.shape.value}
                 for layout in table_layouts
             ]
         }
+        body = orjson.dumps(export)
+        with _EXPORT_CACHE_LOCK:
+            _export_cache[room_id] = (version, export, body, time.monotonic())
+            _export_cache.move_to_end(room_id)
+            while len(_export_cache) > _EXPORT_CACHE_MAX_ENTRIES:
+                _export_cache.popitem(last=False)
+        return export, body
+
+    def _copy_table_layouts(self, rows: List[Dict[str, Any]]):
+        """Stream table layout rows in with COPY on PostgreSQL; other backends use a batched INSERT"""
+        conn = self.db.connection()
+        if conn.dialect.name != "postgresql":
+            self.db.bulk_insert_mappings(TableLayout, rows)
+            return
+
+        # Values go through each column type's bind processor, so they match what the ORM would write
+        columns = [TableLayout.__table__.c[name] for name in ("id",) + _TABLE_LAYOUT_FIELDS]
+        processors = [column.type.bind_processor(conn.dialect) for column in columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            row = {**row, "id": str(uuid.uuid4())}
+            values = []
+            for column, process in zip(columns, processors):
+                value = row.get(column.name)
+                if value is not None and process is not None:
+                    value = process(value)
+                values.append(r"\N" if value is None else value)
+            writer.writerow(values)
+        buffer.seek(0)
+
+        column_list = ", ".join(column.name for column in columns)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY table_layouts ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
 
     def import_room_layout(self, room_id: str, layout_data: Dict[str, Any]) -> bool:
         """Import room layout from JSON"""
         try:
             # Update room layout
             room_layout_data = layout_data.get("room_layout", {})
-            self.update_room_layout(room_id, RoomLayoutUpdate(**room_layout_data))
+            self.update_room_layout(room_id, RoomLayoutUpdate(**room_layout_data), flush_only=True)
             
-            # Clear existing table layouts
-            existing_layouts = self.get_table_layouts_by_room(room_id)
-            for layout in existing_layouts:
-                self.db.delete(layout)
+            # Clear existing table layouts with a single DELETE
+            self.db.query(TableLayout).filter(
+                TableLayout.room_id == room_id
+            ).delete(synchronize_session=False)
             
-            # Create new table layouts
+            # Validate and insert new table layouts in one batch
+            new_layouts = []
             for table_layout_data in layout_data.get("table_layouts", []):
-                self.create_table_layout(TableLayoutCreate(
+                validated = TableLayoutCreate(
                     table_id=table_layout_data["table_id"],
                     room_id=room_id,
                     **{k: v for k, v in table_layout_data.items() if k != "table_id"}
-                ))
+                )
+                new_layouts.append({field: getattr(validated, field) for field in _TABLE_LAYOUT_FIELDS})
+            if new_layouts:
+                self._copy_table_layouts(new_layouts)
             
             self.db.commit()
+            self._clear_room_cache(room_id)
             return True
         except Exception as e:
             self.db.rollback()
@@ -1,199 +1,214 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import date
-from jinja2 import Template
-from app.schemas.reservation import ReservationWithTables
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+from app.schemas.reservation import ReservationResponse
+import base64
+import functools
 import io
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
-class PDFService:
-    def __init__(self):
-        self.html_template = """
+# Candidate logo locations, covering local runs and the container layout
+_LOGO_PATHS = (
+    "static/logo.png",
+    "/app/static/logo.png",
+    os.path.join(os.getcwd(), "static", "logo.png"),
+    os.path.join(os.path.dirname(__file__), "..", "..", "static", "logo.png"),
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "static", "logo.png"),
+    "/app/app/static/logo.png",
+    "app/static/logo.png",
+)
+
+
+# Kept out of the HTML so WeasyPrint parses it once per process, not once per render
+_PDF_CSS = """
+@page {
+    size: A4;
+    margin: 0.5cm;
+}
+
+body {
+    font-family: Arial, sans-serif;
+    font-size: 8px;
+    line-height: 1.2;
+    margin: 0;
+    padding: 0;
+}
+
+.page-header {
+    text-align: center;
+    margin-bottom: 10px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    gap: 10px;
+    border-bottom: 2px solid #333;
+    padding-bottom: 5px;
+}
+
+.logo {
+    width: 30px;
+    height: 30px;
+    object-fit: contain;
+}
+
+.header-text {
+    text-align: center;
+}
+
+.restaurant-name {
+    font-size: 14px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 2px;
+}
+
+.date-time {
+    font-size: 10px;
+    color: #7f8c8d;
+}
+
+.reservations-grid {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 8px;
+    page-break-inside: avoid;
+}
+
+.reservation-slip {
+    border: 1px solid #333;
+    padding: 10px;
+    page-break-inside: avoid;
+    position: relative;
+    background-color: #f9f9f9;
+    min-height: 160px;
+}
+
+.slip-logo {
+    width: 40px;
+    height: 40px;
+    object-fit: contain;
+    display: block;
+    margin: 0 auto 4px auto;
+}
+
+.reserved-banner {
+    text-align: center;
+    font-size: 22px;
+    font-weight: 900;
+    color: #c0392b;
+    letter-spacing: 2px;
+    margin-bottom: 8px;
+}
+
+.customer-name {
+    font-size: 16px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 3px;
+    text-align: center;
+    background-color: #e8f4fd;
+    padding: 2px;
+    border-radius: 3px;
+}
+
+.reservation-details {
+    background-color: #ffffff;
+    padding: 5px;
+    border-radius: 3px;
+    margin-bottom: 8px;
+    border: 1px solid #ddd;
+}
+
+.detail-row {
+    display: flex;
+    justify-content: space-between;
+    margin-bottom: 2px;
+    font-size: 7px;
+}
+
+.detail-label {
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+.detail-value {
+    color: #34495e;
+}
+
+.time-strong { font-weight: 900; font-size: 20px; color: #111; }
+
+.tables-info {
+    background-color: #e8f4fd;
+    padding: 3px;
+    border-radius: 3px;
+    margin-bottom: 3px;
+    font-size: 10px;
+}
+
+.page-break {
+    page-break-before: always;
+}
+
+/* Ensure 5 rows per page */
+.page {
+    height: 100vh;
+    display: flex;
+    flex-direction: column;
+}
+
+.page-content {
+    flex: 1;
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    grid-template-rows: repeat(4, 1fr);
+    gap: 5px;
+}
+"""
+
+_HTML_TEMPLATE = """
         <!DOCTYPE html>
         <html>
         <head>
             <meta charset="UTF-8">
-            <title>Daily Reservations - {{ date.strftime('%A, %B %d, %Y') }}</title>
-            <style>
-                @page {
-                    size: A4;
-                    margin: 0.5cm;
-                }
-                
-                body {
-                    font-family: Arial, sans-serif;
-                    font-size: 8px;
-                    line-height: 1.2;
-                    margin: 0;
-                    padding: 0;
-                }
-                
-                .page-header {
-                    text-align: center;
-                    margin-bottom: 10px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 10px;
-                    border-bottom: 2px solid #333;
-                    padding-bottom: 5px;
-                }
-                
-                .logo {
-                    width: 30px;
-                    height: 30px;
-                    object-fit: contain;
-                }
-                
-                .header-text {
-                    text-align: center;
-                }
-                
-                .restaurant-name {
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #2c3e50;
-                    margin-bottom: 2px;
-                }
-                
-                .date-time {
-                    font-size: 10px;
-                    color: #7f8c8d;
-                }
-                
-                .reservations-grid {
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    gap: 8px;
-                    page-break-inside: avoid;
-                }
-                
-                .reservation-slip {
-                    border: 1px solid #333;
-                    padding: 10px;
-                    page-break-inside: avoid;
-                    position: relative;
-                    background-color: #f9f9f9;
-                    min-height: 160px;
-                }
-
-                .slip-logo {
-                    width: 40px;
-                    height: 40px;
-                    object-fit: contain;
-                    display: block;
-                    margin: 0 auto 4px auto;
-                }
-
-                .reserved-banner {
-                    text-align: center;
-                    font-size: 22px;
-                    font-weight: 900;
-                    color: #c0392b;
-                    letter-spacing: 2px;
-                    margin-bottom: 8px;
-                }
-                
-                .customer-name {
-                    font-size: 16px;
-                    font-weight: bold;
-                    color: #2c3e50;
-                    margin-bottom: 3px;
-                    text-align: center;
-                    background-color: #e8f4fd;
-                    padding: 2px;
-                    border-radius: 3px;
-                }
-                
-                .reservation-details {
-                    background-color: #ffffff;
-                    padding: 5px;
-                    border-radius: 3px;
-                    margin-bottom: 8px;
-                    border: 1px solid #ddd;
-                }
-                
-                .detail-row {
-                    display: flex;
-                    justify-content: space-between;
-                    margin-bottom: 2px;
-                    font-size: 7px;
-                }
-                
-                .detail-label {
-                    font-weight: bold;
-                    color: #2c3e50;
-                }
-                
-                .detail-value {
-                    color: #34495e;
-                }
-
-                .time-strong { font-weight: 900; font-size: 20px; color: #111; }
-                
-                .tables-info {
-                    background-color: #e8f4fd;
-                    padding: 3px;
-                    border-radius: 3px;
-                    margin-bottom: 3px;
-                    font-size: 10px;
-                }
-                
-                .page-break {
-                    page-break-before: always;
-                }
-                
-                /* Ensure 5 rows per page */
-                .page {
-                    height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                }
-                
-                .page-content {
-                    flex: 1;
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    grid-template-rows: repeat(4, 1fr);
-                    gap: 5px;
-                }
-            </style>
+            <title>Daily Reservations - {{ date_str }}</title>
         </head>
         <body>
             <div class="page-header">
                 <img src="data:image/png;base64,{{ logo_base64 }}" alt="The Castle Pub Logo" class="logo">
                 <div class="header-text">
                     <div class="restaurant-name">The Castle Pub</div>
-                    <div class="date-time">Daily Reservations - {{ date.strftime('%A, %B %d, %Y') }}</div>
+                    <div class="date-time">Daily Reservations - {{ date_str }}</div>
                 </div>
             </div>
             
             <div class="page-content">
-            {% for reservation in reservations %}
+            {% for row in cards %}
             <div class="reservation-slip">
                 <img src="data:image/png;base64,{{ logo_base64 }}" alt="Logo" class="slip-logo">
                 <div class="reserved-banner">RESERVED</div>
-                <div class="customer-name">{{ reservation.customer_name }}</div>
+                <div class="customer-name">{{ row['customer_name'] }}</div>
                 
                 <div class="reservation-details">
                     <div class="detail-row">
                         <span class="detail-label">Date:</span>
-                        <span class="detail-value">{{ reservation.date.strftime('%m/%d') }}</span>
+                        <span class="detail-value">{{ row['date_str'] }}</span>
                     </div>
                     <div class="detail-row">
                         <span class="detail-label">Time:</span>
-                        <span class="detail-value time-strong">{{ reservation.time.strftime('%I:%M %p') }}</span>
+                        <span class="detail-value time-strong">{{ row['time_str'] }}</span>
                     </div>
                 </div>
                 
-                {% if reservation.tables %}
+                {% if row['table_names'] %}
                 <div class="tables-info">
                     <div class="detail-label">Table:</div>
-                    {% for table in reservation.tables %}
+                    {% for table_name in row['table_names'] %}
                     <div class="detail-row">
-                        <span>{{ table.table_name }}</span>
+                        <span>{{ table_name }}</span>
                     </div>
                     {% endfor %}
                 </div>
@@ -205,69 +220,154 @@ class PDFService:
         </html>
         """
 
-    def generate_daily_pdf(self, reservations: List[ReservationWithTables], target_date: date) -> bytes:
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """Compiled template code kept on disk, so fresh worker processes skip Jinja's compile step"""
+    try:
+        return FileSystemBytecodeCache()
+    except Exception as e:
+        logger.warning(f"Jinja bytecode cache unavailable, compiling templates in memory: {e}")
+        return None
+
+
+# The PDF template is loaded once at import; PDFService itself is created per request
+_env = Environment(
+    loader=DictLoader({"daily_pdf.html": _HTML_TEMPLATE}),
+    autoescape=True,
+    auto_reload=False,
+    bytecode_cache=_bytecode_cache(),
+)
+_TEMPLATE = _env.get_template("daily_pdf.html")
+
+
+@functools.lru_cache(maxsize=1)
+def _weasyprint_font_config():
+    """One WeasyPrint FontConfiguration per process, so fonts are discovered once rather than per PDF"""
+    from weasyprint.text.fonts import FontConfiguration  # type: ignore
+    return FontConfiguration()
+
+
+@functools.lru_cache(maxsize=1)
+def _weasyprint_stylesheet():
+    """The PDF stylesheet parsed once into a WeasyPrint CSS object"""
+    from weasyprint import CSS  # type: ignore
+    return CSS(string=_PDF_CSS, font_config=_weasyprint_font_config())
+
+
+class PDFService:
+    # Encoded logo, looked up once per process; "" when no logo file exists
+    _logo_b64_cache: Optional[str] = None
+    # Decoded logo for the ReportLab fallback, shared across pages and calls
+    _logo_image_reader = None
+
+    @classmethod
+    def _get_logo_base64(cls) -> str:
+        """Base64 of the logo PNG, read from disk on first use only"""
+        if cls._logo_b64_cache is not None:
+            return cls._logo_b64_cache
+
+        logo_base64 = ""
+        logo_found = False
+        for logo_path in _LOGO_PATHS:
+            if os.path.exists(logo_path):
+                try:
+                    with open(logo_path, "rb") as logo_file:
+                        logo_base64 = base64.b64encode(logo_file.read()).decode('utf-8')
+                    logger.info(f"Logo loaded successfully from {logo_path}")
+                    logo_found = True
+                    break
+                except Exception as e:
+                    logger.warning(f"Failed to load logo from {logo_path}: {e}")
+                    continue
+
+        if not logo_found:
+            logger.warning("Logo file not found in any expected location, PDF will be generated without logo")
+            # List all files in static directory for debugging
+            static_dirs = ["static", "/app/static", "app/static"]
+            for static_dir in static_dirs:
+                if os.path.exists(static_dir):
+                    try:
+                        files = os.listdir(static_dir)
+                        logger.info(f"Files in {static_dir}: {files}")
+                    except Exception as e:
+                        logger.warning(f"Could not list files in {static_dir}: {e}")
+
+        cls._logo_b64_cache = logo_base64
+        return logo_base64
+
+    @classmethod
+    def _get_logo_image_reader(cls):
+        """ReportLab ImageReader over the logo, decoded on first use only"""
+        if cls._logo_image_reader is None:
+            from reportlab.lib.utils import ImageReader
+            cls._logo_image_reader = ImageReader(io.BytesIO(base64.b64decode(cls._get_logo_base64())))
+        return cls._logo_image_reader
+
+    @staticmethod
+    def _prepare_rows(reservations: List[ReservationResponse]) -> List[Dict[str, Any]]:
+        """Format each reservation's printed fields once, for both the template and ReportLab"""
+        # A day's reservations share one date and a handful of time slots; format each value once
+        date_strs = {d: d.strftime('%m/%d') for d in {r.date for r in reservations}}
+        time_strs = {t: t.strftime('%I:%M %p') for t in {r.time for r in reservations}}
+        return [
+            {
+                "customer_name": r.customer_name or "",
+                "date_str": date_strs[r.date],
+                "time_str": time_strs[r.time],
+                "table_names": [t.table_name for t in r.tables],
+                "id_short": r.id[:8],
+            }
+            for r in reservations
+        ]
+
+    def _draw_page_header(self, c, page_height: float, date_str: str, with_logo: bool) -> float:
+        """Draw the daily PDF page header (ReportLab) and return the top of the card grid"""
+        from reportlab.lib import colors
+        from reportlab.lib.units import mm
+
+        y = page_height - 20 * mm
+        if with_logo:
+            try:
+                c.drawImage(self._get_logo_image_reader(), 15 * mm, y - 12 * mm, width=12 * mm, height=12 * mm, preserveAspectRatio=True, mask='auto')
+            except Exception:
+                pass
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(30 * mm, y - 6 * mm, "The Castle Pub - Daily Reservations")
+        c.setFont("Helvetica", 9)
+        c.drawString(30 * mm, y - 11 * mm, date_str)
+        # Card borders share one stroke state; showPage resets it, so set it per page, not per card
+        c.setLineWidth(1)
+        c.setStrokeColor(colors.black)
+        return y - 16 * mm
+
+    def generate_daily_pdf(self, reservations: List[ReservationResponse], target_date: date) -> bytes:
         """Generate PDF with daily reservation slips"""
         try:
             from datetime import datetime
-            import base64
-            import os
             # Try WeasyPrint first; fall back to ReportLab if unavailable in the environment
             try:
                 from weasyprint import HTML  # type: ignore
             except Exception as weasy_err:  # pragma: no cover
                 HTML = None  # type: ignore
             
-            # Load and encode logo
-            logo_base64 = ""
-            # Try multiple possible paths for the logo
-            possible_logo_paths = [
-                "static/logo.png",
-                "/app/static/logo.png",
-                os.path.join(os.getcwd(), "static", "logo.png"),
-                os.path.join(os.path.dirname(__file__), "..", "..", "static", "logo.png"),
-                os.path.join(os.path.dirname(__file__), "..", "..", "..", "static", "logo.png"),
-                "/app/app/static/logo.png",
-                "app/static/logo.png"
-            ]
-            
-            logo_found = False
-            for logo_path in possible_logo_paths:
-                if os.path.exists(logo_path):
-                    try:
-                        with open(logo_path, "rb") as logo_file:
-                            logo_data = logo_file.read()
-                            logo_base64 = base64.b64encode(logo_data).decode('utf-8')
-                        logger.info(f"Logo loaded successfully from {logo_path}")
-                        logo_found = True
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to load logo from {logo_path}: {e}")
-                        continue
-            
-            if not logo_found:
-                logger.warning("Logo file not found in any expected location, PDF will be generated without logo")
-                # List all files in static directory for debugging
-                static_dirs = ["static", "/app/static", "app/static"]
-                for static_dir in static_dirs:
-                    if os.path.exists(static_dir):
-                        try:
-                            files = os.listdir(static_dir)
-                            logger.info(f"Files in {static_dir}: {files}")
-                        except Exception as e:
-                            logger.warning(f"Could not list files in {static_dir}: {e}")
-            
+            logo_base64 = self._get_logo_base64()
+
+            cards = self._prepare_rows(reservations)
+            date_str = target_date.strftime('%A, %B %d, %Y')
+
             # Render HTML template
-            template = Template(self.html_template)
-            html_content = template.render(
-                reservations=reservations,
-                date=target_date,
+            html_content = _TEMPLATE.render(
+                cards=cards,
+                date_str=date_str,
                 generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 logo_base64=logo_base64
             )
 
             if HTML is not None:
                 try:
-                    pdf_bytes = HTML(string=html_content).write_pdf()
+                    pdf_bytes = HTML(string=html_content).write_pdf(
+                        stylesheets=[_weasyprint_stylesheet()], font_config=_weasyprint_font_config()
+                    )
                     logger.info(f"Generated PDF for {target_date} with {len(reservations)} reservations (WeasyPrint)")
                     return pdf_bytes
                 except Exception as e:  # pragma: no cover
@@ -279,28 +379,15 @@ class PDFService:
                 from reportlab.pdfgen import canvas
                 from reportlab.lib import colors
                 from reportlab.lib.units import mm
-                from reportlab.lib.utils import ImageReader
-                import io
 
                 buffer = io.BytesIO()
                 c = canvas.Canvas(buffer, pagesize=A4)
                 page_width, page_height = A4
 
                 # Header with logo and date
-                y = page_height - 20 * mm
-                if logo_base64:
-                    try:
-                        logo_bytes = base64.b64decode(logo_base64)
-                        c.drawImage(ImageReader(io.BytesIO(logo_bytes)), 15 * mm, y - 12 * mm, width=12 * mm, height=12 * mm, preserveAspectRatio=True, mask='auto')
-                    except Exception:
-                        pass
-                c.setFont("Helvetica-Bold", 12)
-                c.drawString(30 * mm, y - 6 * mm, "The Castle Pub - Daily Reservations")
-                c.setFont("Helvetica", 9)
-                c.drawString(30 * mm, y - 11 * mm, target_date.strftime('%A, %B %d, %Y'))
+                top_margin = self._draw_page_header(c, page_height, date_str, bool(logo_base64))
 
                 # Grid: 2 columns x 4 rows per page (larger cards)
-                top_margin = y - 16 * mm
                 left_margin = 10 * mm
                 right_margin = 10 * mm
                 bottom_margin = 10 * mm
@@ -310,72 +397,60 @@ class PDFService:
                 card_width = (page_width - left_margin - right_margin - gap) / cols
                 card_height = (top_margin - bottom_margin - (rows - 1) * gap) / rows
 
-                def draw_reservation_card(ix: int, reservation: ReservationWithTables):
+                banner_red = colors.HexColor("#c0392b")
+
+                def draw_reservation_card(ix: int, card: Dict[str, Any]):
                     col = ix % cols
                     row = ix // cols
                     if row >= rows:
                         return False
                     x = left_margin + col * (card_width + gap)
                     y0 = top_margin - row * (card_height + gap)
-                    # Border
-                    c.setLineWidth(1)
-                    c.setStrokeColor(colors.black)
+                    # Border (stroke state is set once per page by the header)
                     c.setFillColor(colors.whitesmoke)
                     c.roundRect(x, y0 - card_height, card_width, card_height, 4 * mm, stroke=1, fill=1)
 
                     # RESERVED banner
-                    c.setFillColor(colors.HexColor("#c0392b"))
+                    c.setFillColor(banner_red)
                     c.setFont("Helvetica-Bold", 22)
                     c.drawCentredString(x + card_width / 2, y0 - 8 * mm, "RESERVED")
 
                     # Customer name
                     c.setFillColor(colors.black)
                     c.setFont("Helvetica-Bold", 16)
-                    c.drawCentredString(x + card_width / 2, y0 - 15 * mm, (reservation.customer_name or ""))
+                    c.drawCentredString(x + card_width / 2, y0 - 15 * mm, card["customer_name"])
 
                     # Details
                     text_x = x + 6 * mm
                     line_y = y0 - 22 * mm
                     c.setFont("Helvetica", 11)
-                    c.drawString(text_x, line_y, f"Date: {reservation.date.strftime('%m/%d') if hasattr(reservation.date, 'strftime') else ''}")
+                    c.drawString(text_x, line_y, f"Date: {card['date_str']}")
                     c.setFont("Helvetica-Bold", 18)
-                    c.drawString(text_x + 70, line_y, f"Time: {reservation.time.strftime('%I:%M %p') if hasattr(reservation.time, 'strftime') else ''}")
+                    c.drawString(text_x + 70, line_y, f"Time: {card['time_str']}")
 
                     # Tables
                     table_y = line_y - 11 * mm
-                    tables = getattr(reservation, 'tables', []) or []
-                    if tables:
+                    if card["table_names"]:
                         c.setFont("Helvetica-Bold", 11)
                         c.drawString(text_x, table_y, "Table:")
                         c.setFont("Helvetica", 12)
-                        names = ", ".join([t.get('table_name') if isinstance(t, dict) else getattr(t, 'table_name', '') for t in tables])
+                        names = ", ".join(card["table_names"])
                         c.drawString(text_x + 35, table_y, names[:60])
 
                     # Footer
                     c.setFont("Helvetica", 7)
                     c.setFillColor(colors.gray)
-                    c.drawRightString(x + card_width - 4 * mm, y0 - card_height + 4 * mm, f"ID: {str(getattr(reservation, 'id', ''))[:8]}")
+                    c.drawRightString(x + card_width - 4 * mm, y0 - card_height + 4 * mm, f"ID: {card['id_short']}")
                     c.setFillColor(colors.black)
                     return True
 
                 # Draw up to 10 per page
                 idx_on_page = 0
-                for i, r in enumerate(reservations):
+                for i, r in enumerate(cards):
                     if idx_on_page >= cols * rows:
                         c.showPage()
                         # draw header again for new page
-                        y = page_height - 20 * mm
-                        if logo_base64:
-                            try:
-                                logo_bytes = base64.b64decode(logo_base64)
-                                c.drawImage(ImageReader(io.BytesIO(logo_bytes)), 15 * mm, y - 12 * mm, width=12 * mm, height=12 * mm, preserveAspectRatio=True, mask='auto')
-                            except Exception:
-                                pass
-                        c.setFont("Helvetica-Bold", 12)
-                        c.drawString(30 * mm, y - 6 * mm, "The Castle Pub - Daily Reservations")
-                        c.setFont("Helvetica", 9)
-                        c.drawString(30 * mm, y - 11 * mm, target_date.strftime('%A, %B %d, %Y'))
-                        top_margin = y - 16 * mm
+                        top_margin = self._draw_page_header(c, page_height, date_str, bool(logo_base64))
                         idx_on_page = 0
                     if draw_reservation_card(idx_on_page, r):
                         idx_on_page += 1
@@ -393,59 +468,34 @@ class PDFService:
             logger.error(f"Error generating daily PDF: {str(e)}")
             raise
 
-    def generate_reservation_slip(self, reservation: ReservationWithTables) -> bytes:
+    def generate_reservation_slip(self, reservation: ReservationResponse) -> bytes:
         """Generate a single reservation slip PDF"""
         try:
             from datetime import datetime
-            import base64
-            import os
-            from weasyprint import HTML
-            
-            # Load and encode logo
-            logo_base64 = ""
-            # Try multiple possible paths for the logo
-            possible_logo_paths = [
-                "static/logo.png",
-                "/app/static/logo.png",
-                os.path.join(os.getcwd(), "static", "logo.png"),
-                os.path.join(os.path.dirname(__file__), "..", "..", "static", "logo.png")
-            ]
-            
-            logo_found = False
-            for logo_path in possible_logo_paths:
-                if os.path.exists(logo_path):
-                    try:
-                        with open(logo_path, "rb") as logo_file:
-                            logo_data = logo_file.read()
-                            logo_base64 = base64.b64encode(logo_data).decode('utf-8')
-                        logger.info(f"Logo loaded successfully from {logo_path}")
-                        logo_found = True
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to load logo from {logo_path}: {e}")
-                        continue
-            
-            if not logo_found:
-                logger.warning("Logo file not found in any expected location, PDF will be generated without logo")
-            
+
+            logo_base64 = self._get_logo_base64()
+
             # Try WeasyPrint first; fall back to ReportLab
             try:
                 from weasyprint import HTML  # type: ignore
             except Exception:
                 HTML = None  # type: ignore
 
+            card = self._prepare_rows([reservation])[0]
+
             # Render HTML template for single reservation
-            template = Template(self.html_template)
-            html_content = template.render(
-                reservations=[reservation],
-                date=reservation.date,
+            html_content = _TEMPLATE.render(
+                cards=[card],
+                date_str=reservation.date.strftime('%A, %B %d, %Y'),
                 generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 logo_base64=logo_base64
             )
 
             if HTML is not None:
                 try:
-                    pdf_bytes = HTML(string=html_content).write_pdf()
+                    pdf_bytes = HTML(string=html_content).write_pdf(
+                        stylesheets=[_weasyprint_stylesheet()], font_config=_weasyprint_font_config()
+                    )
                     logger.info(f"Generated PDF for reservation {reservation.id} (WeasyPrint)")
                     return pdf_bytes
                 except Exception as e:  # pragma: no cover
@@ -457,8 +507,6 @@ class PDFService:
                 from reportlab.pdfgen import canvas
                 from reportlab.lib import colors
                 from reportlab.lib.units import mm
-                from reportlab.lib.utils import ImageReader
-                import io, base64
 
                 buffer = io.BytesIO()
                 c = canvas.Canvas(buffer, pagesize=A4)
@@ -468,8 +516,7 @@ class PDFService:
                 y = page_height - 20 * mm
                 if logo_base64:
                     try:
-                        logo_bytes = base64.b64decode(logo_base64)
-                        c.drawImage(ImageReader(io.BytesIO(logo_bytes)), 15 * mm, y - 12 * mm, width=12 * mm, height=12 * mm, preserveAspectRatio=True, mask='auto')
+                        c.drawImage(self._get_logo_image_reader(), 15 * mm, y - 12 * mm, width=12 * mm, height=12 * mm, preserveAspectRatio=True, mask='auto')
                     except Exception:
                         pass
                 c.setFont("Helvetica-Bold", 12)
@@ -489,21 +536,20 @@ class PDFService:
 
                 c.setFillColor(colors.black)
                 c.setFont("Helvetica-Bold", 18)
-                c.drawCentredString(x + card_width / 2, y0 - 16 * mm, (reservation.customer_name or ""))
+                c.drawCentredString(x + card_width / 2, y0 - 16 * mm, card["customer_name"])
 
                 text_x = x + 8 * mm
                 line_y = y0 - 24 * mm
                 c.setFont("Helvetica", 12)
-                c.drawString(text_x, line_y, f"Date: {reservation.date.strftime('%m/%d') if hasattr(reservation.date, 'strftime') else ''}")
+                c.drawString(text_x, line_y, f"Date: {card['date_str']}")
                 c.setFont("Helvetica-Bold", 20)
-                c.drawString(text_x + 90, line_y, f"Time: {reservation.time.strftime('%I:%M %p') if hasattr(reservation.time, 'strftime') else ''}")
+                c.drawString(text_x + 90, line_y, f"Time: {card['time_str']}")
 
-                tables = getattr(reservation, 'tables', []) or []
-                if tables:
+                if card["table_names"]:
                     c.setFont("Helvetica-Bold", 12)
                     c.drawString(text_x, line_y - 12 * mm, "Table:")
                     c.setFont("Helvetica", 12)
-                    names = ", ".join([t.get('table_name') if isinstance(t, dict) else getattr(t, 'table_name', '') for t in tables])
+                    names = ", ".join(card["table_names"])
                     c.drawString(text_x + 35, line_y - 12 * mm, names[:60])
 
                 c.showPage()
@@ -6,7 +6,7 @@ import uuid
 from app.models.reservation import Reservation, ReservationStatus, ReservationTable
 from app.models.room import Room, AreaType
 from app.models.table import Table
-from app.schemas.reservation import ReservationCreate, ReservationUpdate, ReservationWithTables
+from app.schemas.reservation import ReservationCreate, ReservationUpdate, ReservationResponse
 from app.services.table_service import TableService
 from app.services.working_hours_service import WorkingHoursService
 # from app.services.area_service import AreaService  # Temporarily disabled
@@ -23,7 +23,7 @@ class ReservationService:
         self.working_hours_service = WorkingHoursService(db)
         # self.area_service = AreaService(db)  # Temporarily disabled
 
-    def create_reservation(self, reservation_data: ReservationCreate) -> ReservationWithTables:
+    def create_reservation(self, reservation_data: ReservationCreate) -> ReservationResponse:
         """Create a new reservation with intelligent area and table assignment"""
         # Validate business rules
         self._validate_reservation_request(reservation_data)
@@ -84,7 +84,7 @@ class ReservationService:
             } for table in table_combo
         ]
         
-        return ReservationWithTables(
+        return ReservationResponse(
             id=str(reservation.id),
             customer_name=reservation.customer_name,
             email=reservation.email,
@@ -104,7 +104,7 @@ class ReservationService:
             tables=table_assignments
         )
 
-    def get_reservation(self, reservation_id: str) -> Optional[ReservationWithTables]:
+    def get_reservation(self, reservation_id: str) -> Optional[ReservationResponse]:
         """Get a reservation by ID with table assignments"""
         reservation = self.db.query(Reservation).filter(
             Reservation.id == reservation_id
@@ -127,7 +127,7 @@ class ReservationService:
                     "capacity": table.capacity
                 })
         
-        return ReservationWithTables(
+        return ReservationResponse(
             id=str(reservation.id),
             customer_name=reservation.customer_name,
             email=reservation.email,
@@ -147,7 +147,7 @@ class ReservationService:
             tables=table_assignments
         )
 
-    def update_reservation(self, reservation_id: str, update_data: ReservationUpdate) -> Optional[ReservationWithTables]:
+    def update_reservation(self, reservation_id: str, update_data: ReservationUpdate) -> Optional[ReservationResponse]:
         """Update a reservation"""
         reservation = self.db.query(Reservation).filter(
             Reservation.id == reservation_id
@@ -209,7 +209,7 @@ class ReservationService:
         self.db.commit()
         return True
 
-    def get_reservations_for_date(self, date: date, room_id: Optional[str] = None) -> List[ReservationWithTables]:
+    def get_reservations_for_date(self, date: date, room_id: Optional[str] = None) -> List[ReservationResponse]:
         """Get all reservations for a specific date"""
         query = self.db.query(Reservation).filter(
             and_(
@@ -237,7 +237,7 @@ class ReservationService:
         email: Optional[str] = None,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None
-    ) -> List[ReservationWithTables]:
+    ) -> List[ReservationResponse]:
         """Search reservations by various criteria"""
         query = self.db.query(Reservation)
         